@@ -1,5 +1,8 @@
 """LLM Grading System - Main entry point."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 from modelgrader.config import load_settings, parse_question_numbers
 from modelgrader.console_output import (
     add_result_to_table,
@@ -15,16 +18,22 @@ from modelgrader.console_output import (
     print_summary,
 )
 from modelgrader.csv_writer import (
-    append_result_to_csv,
-    initialize_csv,
+    CsvAppender,
+    initialize_or_resume,
     load_all_results,
-    load_existing_results,
     write_results_to_csv,
 )
 from modelgrader.gemini_grader import configure_gemini
+from modelgrader.grade_cache import GradeCache
 from modelgrader.logging import configure_logging, get_logger
-from modelgrader.models import calculate_percentiles
-from modelgrader.test_runner import load_questions, run_single_test
+from modelgrader.models import Question, calculate_percentiles
+from modelgrader.test_runner import (
+    build_prompt,
+    grade_batch_responses_async,
+    load_questions,
+    preload_contexts,
+    query_batch_async,
+)
 from modelgrader.watsonx_client import create_watsonx_client, list_available_models
 
 logger = get_logger(__name__)
@@ -39,155 +48,217 @@ def main() -> None:
     print_header()
 
     try:
-        # Load configuration
-        logger.info("loading_configuration")
-        settings = load_settings()
-
-        # Configure Gemini
-        configure_gemini(settings.gemini_api_key)
-
-        # Create WatsonX client
-        watsonx_client = create_watsonx_client(
-            api_key=settings.watsonx_api_key,
-            project_id=settings.watsonx_project_id,
-            url=settings.watsonx_url,
+        asyncio.run(_amain())
+    except Exception as e:
+        logger.error("main_failed", error=str(e), exc_info=True)
+        print_error(str(e))
+        raise
+
+
+async def _amain() -> None:
+    """Load configuration, run all pending tests concurrently and report."""
+    # Load configuration
+    logger.info("loading_configuration")
+    settings = load_settings()
+
+    # Create WatsonX client
+    watsonx_client = create_watsonx_client(
+        api_key=settings.watsonx_api_key,
+        project_id=settings.watsonx_project_id,
+        url=settings.watsonx_url,
+        # Each running batch can have several requests in flight
+        max_connections=settings.concurrency * settings.watsonx_concurrency,
+        timeout=settings.request_timeout,
+    )
+
+    # List available models
+    model_ids = list_available_models(watsonx_client)
+    print_models_info(len(model_ids), model_ids)
+
+    # Load questions
+    all_questions = load_questions(settings.questions_dir, settings.contexts_dir)
+
+    # Filter questions based on configuration
+    question_nums_to_test = parse_question_numbers(settings.question_numbers)
+    questions_by_num = {
+        q.number: q for q in all_questions if q.number in question_nums_to_test
+    }
+    questions = list(questions_by_num.values())
+
+    if not questions:
+        raise ValueError(
+            f"No questions found matching numbers: {settings.question_numbers}"
         )
 
-        # List available models
-        model_ids = list_available_models(watsonx_client)
-        print_models_info(len(model_ids), model_ids)
+    logger.info(
+        "filtered_questions",
+        total=len(all_questions),
+        selected=len(questions),
+        numbers=sorted(question_nums_to_test),
+    )
+    print_questions_info(len(questions))
 
-        # Load questions
-        all_questions = load_questions(settings.questions_dir, settings.contexts_dir)
+    if settings.preload_contexts:
+        preload_contexts(questions)
 
-        # Filter questions based on configuration
-        question_nums_to_test = parse_question_numbers(settings.question_numbers)
-        questions = [q for q in all_questions if q.number in question_nums_to_test]
+    # Calculate total tests
+    total_tests = len(model_ids) * len(questions) * 2  # x2 for with/without context
 
-        if not questions:
-            raise ValueError(
-                f"No questions found matching numbers: {settings.question_numbers}"
+    # Initialize CSV file or load existing results
+    existing_results = initialize_or_resume(settings.output_csv_path)
+    print_resume_info(len(existing_results), total_tests)
+
+    # Prompts don't depend on the model, so build each one once up front
+    prompts = {
+        (q.number, with_context): build_prompt(q, with_context)
+        for q in questions
+        for with_context in (False, True)
+    }
+
+    # Group untested questions into one batch per (model, context) pair,
+    # skipping combinations that were already tested in a previous run
+    batches = []
+    for model_id in model_ids:
+        for with_context in (False, True):
+            batch = [
+                q
+                for q in questions
+                if (model_id, q.number, with_context) not in existing_results
+            ]
+            if batch:
+                batches.append((model_id, batch, with_context))
+
+    pending_count = sum(len(batch) for _, batch, _ in batches)
+    logger.info(
+        "pending_tests",
+        pending=pending_count,
+        skipped=total_tests - pending_count,
+        batches=len(batches),
+        concurrency=settings.concurrency,
+        per_model_concurrency=settings.per_model_concurrency,
+        watsonx_concurrency=settings.watsonx_concurrency,
+    )
+
+    # Create progress bar and results table
+    progress = create_progress_bar()
+    results_table = create_results_table()
+    task = progress.add_task("[cyan]Testing models...", total=total_tests)
+    progress.advance(task, total_tests - pending_count)
+    semaphore = asyncio.Semaphore(settings.concurrency)
+    # Batches run in worker threads; the default pool has only a few threads
+    # per CPU, which would cap concurrency below the configured limit
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.concurrency)
+    )
+    # Per-model limits keep one slow model from occupying every global slot
+    model_semaphores = {
+        model_id: asyncio.Semaphore(settings.per_model_concurrency)
+        for model_id in model_ids
+    }
+
+    async def _run_batch(
+        model_id: str, batch: list[Question], with_context: bool, appender: CsvAppender
+    ) -> None:
+        stage = "generate"
+        try:
+            # Take the model's slot before a global one, so batches waiting on a
+            # busy model don't hold global slots that other models could use.
+            # Slots are held until the worker thread returns; the SDK clients
+            # time out each request, since a thread can't be cancelled.
+            async with model_semaphores[model_id], semaphore:
+                responses = await query_batch_async(
+                    client=watsonx_client,
+                    model_id=model_id,
+                    prompts=[prompts[q.number, with_context][1] for q in batch],
+                    max_concurrency=settings.watsonx_concurrency,
+                )
+
+            # Grading doesn't need the model, so its slot is already free for
+            # the model's next batch while this one is graded
+            stage = "grade"
+            async with semaphore:
+                outcomes = await grade_batch_responses_async(
+                    model_id=model_id,
+                    questions=batch,
+                    with_context=with_context,
+                    responses=responses,
+                )
+            # Append to CSV as soon as the batch is done. This runs on the event
+            # loop thread, so appends from concurrent batches never interleave.
+            for outcome in outcomes:
+                if not isinstance(outcome, Exception):
+                    add_result_to_table(results_table, outcome)
+                    appender.append(outcome)
+            # A failed question only loses its own test
+            for question, response, outcome in zip(batch, responses, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.error(
+                        "test_failed",
+                        model_id=model_id,
+                        question_number=question.number,
+                        with_context=with_context,
+                        stage=(
+                            "generate" if isinstance(response, Exception) else "grade"
+                        ),
+                        error=str(outcome),
+                    )
+        except Exception as e:
+            logger.error(
+                "test_failed",
+                model_id=model_id,
+                questions=[q.number for q in batch],
+                with_context=with_context,
+                stage=stage,
+                error=str(e),
             )
+        finally:
+            progress.advance(task, len(batch))
 
-        logger.info(
-            "filtered_questions",
-            total=len(all_questions),
-            selected=len(questions),
-            numbers=question_nums_to_test,
+    # Configure Gemini. The grade cache is opened last, right before the
+    # tests that use it, so it is closed however the run ends.
+    grade_cache = (
+        GradeCache(settings.grade_cache_path) if settings.grade_cache else None
+    )
+    try:
+        configure_gemini(
+            settings.gemini_api_key,
+            rpm=settings.gemini_rpm,
+            tpm=settings.gemini_tpm,
+            grade_cache=grade_cache,
+            request_timeout=settings.request_timeout,
         )
-        print_questions_info(len(questions))
 
-        # Calculate total tests
-        total_tests = len(model_ids) * len(questions) * 2  # x2 for with/without context
+        with progress, CsvAppender(settings.output_csv_path) as appender:
+            # Run all pending batches
+            async with asyncio.TaskGroup() as task_group:
+                for batch in batches:
+                    task_group.create_task(_run_batch(*batch, appender))
+    finally:
+        if grade_cache is not None:
+            grade_cache.close()
 
-        # Initialize CSV file and load existing results
-        initialize_csv(settings.output_csv_path)
-        existing_results = load_existing_results(settings.output_csv_path)
-        print_resume_info(len(existing_results), total_tests)
+    # Load all results (including existing ones) for percentile calculation
+    logger.info("loading_all_results_for_percentile_calculation")
+    all_results = load_all_results(settings.output_csv_path)
 
-        # Create progress bar and results table
-        progress = create_progress_bar()
-        results_table = create_results_table()
-        all_results = []
+    # Calculate percentiles for all results
+    logger.info("calculating_percentiles", result_count=len(all_results))
+    saved_percentiles = [r.percentile for r in all_results]
+    all_results = calculate_percentiles(all_results)
 
-        with progress:
-            task = progress.add_task(
-                "[cyan]Testing models...", total=total_tests
-            )
+    # Print results table
+    print_results_table(results_table)
 
-            # Run all tests
-            for model_id in model_ids:
-                for question in questions:
-                    # Test without context
-                    test_key = (model_id, question.number, False)
-                    if test_key in existing_results:
-                        # Skip already tested
-                        logger.debug(
-                            "skipping_existing_test",
-                            model_id=model_id,
-                            question=question.number,
-                            with_context=False,
-                        )
-                        progress.advance(task)
-                    else:
-                        try:
-                            result = run_single_test(
-                                client=watsonx_client,
-                                model_id=model_id,
-                                question=question,
-                                with_context=False,
-                            )
-                            all_results.append(result)
-                            add_result_to_table(results_table, result)
-                            # Append immediately to CSV
-                            append_result_to_csv(result, settings.output_csv_path)
-                            progress.advance(task)
-                        except Exception as e:
-                            logger.error(
-                                "test_failed",
-                                model_id=model_id,
-                                question=question.number,
-                                with_context=False,
-                                error=str(e),
-                            )
-                            progress.advance(task)
-
-                    # Test with context
-                    test_key = (model_id, question.number, True)
-                    if test_key in existing_results:
-                        # Skip already tested
-                        logger.debug(
-                            "skipping_existing_test",
-                            model_id=model_id,
-                            question=question.number,
-                            with_context=True,
-                        )
-                        progress.advance(task)
-                    else:
-                        try:
-                            result = run_single_test(
-                                client=watsonx_client,
-                                model_id=model_id,
-                                question=question,
-                                with_context=True,
-                            )
-                            all_results.append(result)
-                            add_result_to_table(results_table, result)
-                            # Append immediately to CSV
-                            append_result_to_csv(result, settings.output_csv_path)
-                            progress.advance(task)
-                        except Exception as e:
-                            logger.error(
-                                "test_failed",
-                                model_id=model_id,
-                                question=question.number,
-                                with_context=True,
-                                error=str(e),
-                            )
-                            progress.advance(task)
-
-        # Load all results (including existing ones) for percentile calculation
-        logger.info("loading_all_results_for_percentile_calculation")
-        all_results = load_all_results(settings.output_csv_path)
-
-        # Calculate percentiles for all results
-        logger.info("calculating_percentiles", result_count=len(all_results))
-        all_results = calculate_percentiles(all_results)
-
-        # Print results table
-        print_results_table(results_table)
-
-        # Write CSV
+    # Write CSV, unless the file already holds these exact percentiles (for
+    # example when resuming a run that had nothing left to test)
+    if [r.percentile for r in all_results] != saved_percentiles:
         write_results_to_csv(all_results, settings.output_csv_path)
-        print_success(f"Results saved to {settings.output_csv_path}")
-
-        # Print summary
-        print_summary(all_results)
+    else:
+        logger.info("percentiles_unchanged", path=settings.output_csv_path)
+    print_success(f"Results saved to {settings.output_csv_path}")
 
-    except Exception as e:
-        logger.error("main_failed", error=str(e), exc_info=True)
-        print_error(str(e))
-        raise
+    # Print summary
+    print_summary(all_results)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,7 @@
 """Configuration management using pydantic-settings."""
 
+import re
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -36,6 +38,16 @@ class Settings(BaseSettings):
         default="gemini-2.5-flash-lite",
         description="Gemini model to use for grading",
     )
+    gemini_rpm: int | None = Field(
+        default=None,
+        ge=1,
+        description="Gemini requests per minute quota (unlimited if unset)",
+    )
+    gemini_tpm: int | None = Field(
+        default=None,
+        ge=1,
+        description="Gemini input tokens per minute quota (unlimited if unset)",
+    )
 
     # Application Configuration
     output_csv_path: str = Field(
@@ -56,7 +68,43 @@ class Settings(BaseSettings):
     )
     question_numbers: str = Field(
         default="5",
-        description="Comma-separated list of question numbers to test (e.g., '1' or '1,2,3')",
+        description=(
+            "Comma-separated list of question numbers or ranges to test "
+            "(e.g., '1', '1,2,3' or '1-5,8')"
+        ),
+    )
+    grade_cache: bool = Field(
+        default=False,
+        validation_alias="modelgrader_grade_cache",
+        description="Reuse earlier Gemini grades for identical grading prompts",
+    )
+    preload_contexts: bool = Field(
+        default=False,
+        validation_alias="modelgrader_preload_contexts",
+        description="Read the selected questions' context files before testing starts",
+    )
+    grade_cache_path: str = Field(
+        default="~/.cache/modelgrader/grades.sqlite",
+        validation_alias="modelgrader_grade_cache_path",
+        description="Path to the grade cache database",
+    )
+    concurrency: int = Field(
+        default=8,
+        ge=1,
+        validation_alias="modelgrader_concurrency",
+        description="Maximum number of tests to run concurrently",
+    )
+    per_model_concurrency: int = Field(
+        default=1,
+        ge=1,
+        validation_alias="modelgrader_per_model_concurrency",
+        description="Maximum number of concurrent test batches for a single model",
+    )
+    watsonx_concurrency: int = Field(
+        default=1,
+        ge=1,
+        validation_alias="modelgrader_watsonx_concurrency",
+        description="Maximum number of concurrent WatsonX requests within one test batch",
     )
 
 
@@ -65,13 +113,38 @@ def load_settings() -> Settings:
     return Settings()  # type: ignore[call-arg]
 
 
-def parse_question_numbers(question_numbers_str: str) -> list[int]:
-    """Parse comma-separated question numbers string into a list of integers.
+# A single question number or an inclusive range such as "3-7"
+_QUESTION_TOKEN_RE = re.compile(r"\s*(\d+)(?:\s*-\s*(\d+))?\s*")
+
+
+def parse_question_numbers(question_numbers_str: str) -> set[int]:
+    """Parse comma-separated question numbers and ranges into a set of integers.
 
     Args:
-        question_numbers_str: Comma-separated string like "1,2,3" or "1"
+        question_numbers_str: Comma-separated string like "1,2,3", "1" or "1-5,8"
 
     Returns:
-        List of question numbers as integers
+        Set of question numbers as integers
+
+    Raises:
+        ValueError: If an element is neither a number nor a range, or is a
+            range whose end is below its start
     """
-    return [int(num.strip()) for num in question_numbers_str.split(",") if num.strip()]
+    numbers: set[int] = set()
+    for token in question_numbers_str.split(","):
+        if not token.strip():
+            continue
+
+        match = _QUESTION_TOKEN_RE.fullmatch(token)
+        if match is None:
+            raise ValueError(f"Invalid question number or range: {token.strip()!r}")
+
+        start, end = match.groups()
+        if end is None:
+            numbers.add(int(start))
+        elif int(end) < int(start):
+            raise ValueError(f"Question range ends before it starts: {token.strip()!r}")
+        else:
+            numbers.update(range(int(start), int(end) + 1))
+
+    return numbers
@@ -13,6 +13,10 @@ console = Console()
 def create_progress_bar() -> Progress:
     """Create a configured progress bar for test execution.
 
+    The bar redraws from Rich's own refresh thread on a fixed timer, so
+    advancing it from many concurrent tests never renders on the caller's
+    path. Five redraws per second is plenty for tests that take seconds each.
+
     Returns:
         Configured Progress instance
     """
@@ -23,6 +27,7 @@ def create_progress_bar() -> Progress:
         TextColumn("•"),
         TimeElapsedColumn(),
         console=console,
+        refresh_per_second=5,
     )
 
 
@@ -158,27 +163,40 @@ def print_summary(results: list[TestResult]) -> None:
         console.print("[yellow]No results to summarize[/yellow]")
         return
 
+    # Gather every aggregate in a single pass over the results
     total_tests = len(results)
-    avg_score = sum(r.total_score for r in results) / total_tests
-    avg_time = sum(r.response_time for r in results) / total_tests
-
-    # Find best and worst
-    best = max(results, key=lambda r: r.total_score)
-    worst = min(results, key=lambda r: r.total_score)
+    score_sum = time_sum = with_context_sum = without_context_sum = 0.0
+    with_context_count = 0
+    best = worst = results[0]
+    best_score = worst_score = best.total_score
+
+    for result in results:
+        score = result.total_score
+        score_sum += score
+        time_sum += result.response_time
+
+        if result.context_provided:
+            with_context_sum += score
+            with_context_count += 1
+        else:
+            without_context_sum += score
+
+        # Strict comparisons keep the first best/worst result on ties
+        if score > best_score:
+            best, best_score = result, score
+        if score < worst_score:
+            worst, worst_score = result, score
+
+    avg_score = score_sum / total_tests
+    avg_time = time_sum / total_tests
 
     # Calculate with/without context comparison
-    with_context = [r for r in results if r.context_provided]
-    without_context = [r for r in results if not r.context_provided]
-
+    without_context_count = total_tests - with_context_count
     avg_with_context = (
-        sum(r.total_score for r in with_context) / len(with_context)
-        if with_context
-        else 0
+        with_context_sum / with_context_count if with_context_count else 0
     )
     avg_without_context = (
-        sum(r.total_score for r in without_context) / len(without_context)
-        if without_context
-        else 0
+        without_context_sum / without_context_count if without_context_count else 0
     )
 
     summary_text = f"""[bold]Test Summary[/bold]
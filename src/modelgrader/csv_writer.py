@@ -1,10 +1,20 @@
 """CSV output writer for test results."""
 
+import atexit
+import contextlib
 import csv
+import functools
+import gc
+import os
+from collections.abc import Iterator
 from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+from pydantic import TypeAdapter
 
 from modelgrader.logging import get_logger
-from modelgrader.models import GradeBreakdown, TestResult
+from modelgrader.models import TestResult
 
 logger = get_logger(__name__)
 
@@ -22,6 +32,9 @@ CSV_FIELDNAMES = [
     "Explanation",
 ]
 
+# Validates a whole list of rows at once when loading results
+_TEST_RESULTS_ADAPTER = TypeAdapter(list[TestResult])
+
 
 def initialize_csv(output_path: str | Path) -> None:
     """Initialize a CSV file with headers if it doesn't exist.
@@ -32,15 +45,24 @@ def initialize_csv(output_path: str | Path) -> None:
     output_path = Path(output_path)
 
     if not output_path.exists():
-        logger.info("initializing_csv", path=str(output_path))
-        try:
-            with output_path.open("w", newline="", encoding="utf-8") as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDNAMES)
-                writer.writeheader()
-            logger.info("csv_initialized", path=str(output_path))
-        except Exception as e:
-            logger.error("csv_init_failed", path=str(output_path), error=str(e))
-            raise
+        _write_header(output_path)
+
+
+def _write_header(output_path: Path) -> None:
+    """Create a CSV file containing only the header row.
+
+    Args:
+        output_path: Path to output CSV file
+    """
+    logger.info("initializing_csv", path=str(output_path))
+    try:
+        with output_path.open("w", newline="", encoding="utf-8") as csvfile:
+            csv.writer(csvfile).writerow(CSV_FIELDNAMES)
+        _clear_read_caches()
+        logger.info("csv_initialized", path=str(output_path))
+    except Exception as e:
+        logger.error("csv_init_failed", path=str(output_path), error=str(e))
+        raise
 
 
 def append_result_to_csv(result: TestResult, output_path: str | Path) -> None:
@@ -54,20 +76,126 @@ def append_result_to_csv(result: TestResult, output_path: str | Path) -> None:
 
     try:
         with output_path.open("a", newline="", encoding="utf-8") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDNAMES)
-            row = result.to_csv_row()
-            writer.writerow(row)
+            csv.writer(csvfile).writerow(result.to_csv_tuple())
+        _clear_read_caches()
+
+        logger.debug(
+            "result_appended_to_csv",
+            model=result.model_name,
+            question=result.question_number,
+        )
+
+    except Exception as e:
+        logger.error("csv_append_failed", path=str(output_path), error=str(e))
+        raise
+
+
+def append_results_to_csv(results: list[TestResult], output_path: str | Path) -> None:
+    """Append several test results to the CSV file with a single open.
+
+    Use this instead of calling append_result_to_csv in a loop, which opens
+    and closes the file once per row.
+
+    Args:
+        results: Test results to append, in order
+        output_path: Path to output CSV file
+    """
+    if not results:
+        return
+
+    output_path = Path(output_path)
+
+    try:
+        with output_path.open("a", newline="", encoding="utf-8") as csvfile:
+            csv.writer(csvfile).writerows(result.to_csv_tuple() for result in results)
+        _clear_read_caches()
 
-        logger.debug("result_appended_to_csv", model=result.model_name, question=result.question_number)
+        logger.debug(
+            "results_appended_to_csv", path=str(output_path), result_count=len(results)
+        )
 
     except Exception as e:
         logger.error("csv_append_failed", path=str(output_path), error=str(e))
         raise
 
 
+class CsvAppender:
+    """Append test results to a CSV file through one open file handle.
+
+    Opening the file once per run avoids an open/close (and flush) for every
+    result. Rows are buffered and flushed every ``flush_every`` appends, so at
+    most that many results are lost if the process is killed; the appender is
+    also closed at interpreter exit so results survive an interrupted run.
+    """
+
+    def __init__(self, output_path: str | Path, flush_every: int = 32) -> None:
+        """Open the CSV file for appending, writing headers if it is empty.
+
+        Args:
+            output_path: Path to output CSV file
+            flush_every: Number of appended rows between flushes
+        """
+        self.output_path = Path(output_path)
+        self.flush_every = flush_every
+        self._pending = 0
+        self._file = self.output_path.open(
+            "a", newline="", encoding="utf-8", buffering=1 << 16
+        )
+        # A plain csv.writer fed tuples skips DictWriter's per-row dict lookups
+        self._writer = csv.writer(self._file)
+
+        if self._file.tell() == 0:
+            self._writer.writerow(CSV_FIELDNAMES)
+
+        atexit.register(self.close)
+        logger.debug("csv_appender_opened", path=str(self.output_path))
+
+    def append(self, result: TestResult) -> None:
+        """Append a single test result.
+
+        Args:
+            result: Test result to append
+        """
+        self._writer.writerow(result.to_csv_tuple())
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self._file.flush()
+            self._pending = 0
+        # The buffer can also spill to disk between flushes
+        _clear_read_caches()
+        logger.debug(
+            "result_appended_to_csv",
+            model=result.model_name,
+            question=result.question_number,
+        )
+
+    def close(self) -> None:
+        """Flush buffered rows and close the file. Safe to call more than once."""
+        if self._file.closed:
+            return
+        self._file.close()
+        _clear_read_caches()
+        atexit.unregister(self.close)
+        logger.debug("csv_appender_closed", path=str(self.output_path))
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
 def load_existing_results(output_path: str | Path) -> set[tuple[str, int, bool]]:
     """Load existing test results from CSV to determine what's already been tested.
 
+    Results are memoized on the file's modification time and size, so repeated
+    calls on an unchanged file don't re-read it.
+
     Args:
         output_path: Path to CSV file
 
@@ -76,34 +204,109 @@ def load_existing_results(output_path: str | Path) -> set[tuple[str, int, bool]]
     """
     output_path = Path(output_path)
 
-    if not output_path.exists():
+    try:
+        stat = output_path.stat()
+    except FileNotFoundError:
         logger.info("no_existing_csv", path=str(output_path))
         return set()
 
-    existing = set()
+    return _load_existing_keys(output_path, stat)
+
+
+def initialize_or_resume(output_path: str | Path) -> set[tuple[str, int, bool]]:
+    """Create the CSV file with headers, or load what an earlier run tested.
+
+    Combines initialize_csv and load_existing_results with a single stat of
+    the file.
 
+    Args:
+        output_path: Path to output CSV file
+
+    Returns:
+        Set of (model_name, question_number, context_provided) tuples, empty
+        for a new file
+    """
+    output_path = Path(output_path)
+
+    try:
+        stat = output_path.stat()
+    except FileNotFoundError:
+        _write_header(output_path)
+        return set()
+
+    return _load_existing_keys(output_path, stat)
+
+
+def _load_existing_keys(
+    output_path: Path, stat: os.stat_result
+) -> set[tuple[str, int, bool]]:
+    """Load tested keys from a CSV file that is known to exist.
+
+    Args:
+        output_path: Path to CSV file
+        stat: Result of stat() on the file
+
+    Returns:
+        Set of (model_name, question_number, context_provided) tuples
+    """
     try:
-        with output_path.open("r", newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                model_name = row["Model Name"]
-                # Extract question number from "Q1", "Q2", etc.
-                question_num = int(row["Question"].replace("Q", ""))
-                context_provided = row["Context Provided"] == "Yes"
-                existing.add((model_name, question_num, context_provided))
-
-        logger.info("loaded_existing_results", count=len(existing), path=str(output_path))
+        existing = set(
+            _read_existing_keys(str(output_path), stat.st_mtime_ns, stat.st_size)
+        )
+        logger.info(
+            "loaded_existing_results", count=len(existing), path=str(output_path)
+        )
         return existing
 
     except Exception as e:
-        logger.error("failed_to_load_existing_results", path=str(output_path), error=str(e))
+        logger.error(
+            "failed_to_load_existing_results", path=str(output_path), error=str(e)
+        )
         # If we can't load existing results, return empty set to start fresh
         return set()
 
 
+@functools.lru_cache(maxsize=8)
+def _read_existing_keys(
+    path: str, mtime_ns: int, size: int
+) -> frozenset[tuple[str, int, bool]]:
+    """Read the (model, question, context) keys from a results CSV.
+
+    The modification time and size are part of the cache key, so a file
+    changed by another process is read again; writes from this module also
+    clear the cache through _clear_read_caches.
+
+    Args:
+        path: Path to CSV file
+        mtime_ns: File modification time in nanoseconds
+        size: File size in bytes
+
+    Returns:
+        Frozen set of (model_name, question_number, context_provided) tuples
+    """
+    with open(path, "r", newline="", encoding="utf-8") as csvfile:
+        reader = csv.reader(csvfile)
+        # Resolve column positions once instead of building a dict per row
+        header = next(reader, [])
+        i_model = header.index("Model Name")
+        i_question = header.index("Question")
+        i_context = header.index("Context Provided")
+
+        # Question numbers are stored as "Q1", "Q2", etc.
+        return frozenset(
+            (row[i_model], int(row[i_question][1:]), row[i_context] == "Yes")
+            for row in reader
+            if row
+        )
+
+
 def load_all_results(output_path: str | Path) -> list[TestResult]:
     """Load all test results from CSV file.
 
+    The parsed rows are memoized on the file's modification time and size, so
+    repeated calls on an unchanged file skip reading and parsing it. Each call
+    still returns new TestResult objects that callers are free to modify.
+
     Args:
         output_path: Path to CSV file
 
@@ -112,47 +315,18 @@ def load_all_results(output_path: str | Path) -> list[TestResult]:
     """
     output_path = Path(output_path)
 
-    if not output_path.exists():
+    try:
+        stat = output_path.stat()
+    except FileNotFoundError:
         return []
 
-    results = []
-
     try:
-        with output_path.open("r", newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                # Calculate response time score based on response time
-                response_time = float(row["Response time"])
-                if response_time <= 10:
-                    response_time_score = 95
-                elif response_time <= 30:
-                    response_time_score = 80
-                elif response_time <= 60:
-                    response_time_score = 60
-                elif response_time <= 90:
-                    response_time_score = 40
-                elif response_time <= 120:
-                    response_time_score = 20
-                else:
-                    response_time_score = 5
-
-                # Reconstruct TestResult from CSV row
-                result = TestResult(
-                    model_name=row["Model Name"],
-                    question_number=int(row["Question"].replace("Q", "")),
-                    question_text="",  # Not stored in CSV
-                    context_provided=row["Context Provided"] == "Yes",
-                    response="",  # Not stored in CSV
-                    response_time=response_time,
-                    grades=GradeBreakdown(
-                        accuracy=int(row["Accuracy Score"]),
-                        completeness=int(row["Completeness Score"]),
-                        clarity=int(row["Clarity Score"]),
-                        response_time_score=response_time_score,
-                    ),
-                    percentile=float(row.get("Percentile Rank", 0.0)),
-                )
-                results.append(result)
+        with _gc_paused():
+            rows = _read_result_rows(str(output_path), stat.st_mtime_ns, stat.st_size)
+
+            # Validate all rows in a single pydantic-core call, which is much
+            # cheaper than constructing each model separately
+            results = _TEST_RESULTS_ADAPTER.validate_python(rows)
 
         logger.info("loaded_all_results", count=len(results), path=str(output_path))
         return results
@@ -162,6 +336,96 @@ def load_all_results(output_path: str | Path) -> list[TestResult]:
         return []
 
 
+@functools.lru_cache(maxsize=8)
+def _read_result_rows(path: str, mtime_ns: int, size: int) -> tuple[dict, ...]:
+    """Read a results CSV into plain dicts ready for TestResult validation.
+
+    Args:
+        path: Path to CSV file
+        mtime_ns: File modification time in nanoseconds
+        size: File size in bytes
+
+    Returns:
+        Tuple of row dicts in TestResult field layout
+    """
+    with open(path, "r", newline="", encoding="utf-8") as csvfile:
+        reader = csv.reader(csvfile)
+        # Resolve column positions once instead of building a dict per row
+        header = next(reader, [])
+        i_model = header.index("Model Name")
+        i_question = header.index("Question")
+        i_context = header.index("Context Provided")
+        i_accuracy = header.index("Accuracy Score")
+        i_completeness = header.index("Completeness Score")
+        i_clarity = header.index("Clarity Score")
+        i_time = header.index("Response time")
+        i_percentile = _optional_index(header, "Percentile Rank")
+        i_explanation = _optional_index(header, "Explanation")
+
+        return tuple(
+            {
+                "model_name": row[i_model],
+                "question_number": row[i_question][1:],
+                "question_text": "",  # Not stored in CSV
+                "context_provided": row[i_context] == "Yes",
+                "response": "",  # Not stored in CSV
+                "response_time": row[i_time],
+                "grades": {
+                    "accuracy": row[i_accuracy],
+                    "completeness": row[i_completeness],
+                    "clarity": row[i_clarity],
+                    "explanation": row[i_explanation]
+                    if i_explanation is not None
+                    else "",
+                },
+                "percentile": row[i_percentile] if i_percentile is not None else 0.0,
+            }
+            for row in reader
+            if row
+        )
+
+
+def _clear_read_caches() -> None:
+    """Drop memoized CSV reads after this module writes to a results file.
+
+    The caches are keyed on modification time and size, which a write can
+    leave unchanged (coarse timestamps, or a rewrite of the same length), so
+    every writer clears them explicitly.
+    """
+    _read_existing_keys.cache_clear()
+    _read_result_rows.cache_clear()
+
+
+@contextlib.contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Pause the cyclic garbage collector for the duration of the block.
+
+    Loading a large CSV allocates many dicts and models that never form
+    reference cycles, yet the allocations keep triggering collections that
+    would otherwise take around a quarter of the load time.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _optional_index(header: list[str], column: str) -> int | None:
+    """Return the position of a column that older CSV files may not have.
+
+    Args:
+        header: CSV header row
+        column: Column name to look up
+
+    Returns:
+        Column index, or None if the column is missing
+    """
+    return header.index(column) if column in header else None
+
+
 def write_results_to_csv(results: list[TestResult], output_path: str | Path) -> None:
     """Write all test results to a CSV file (overwrites existing file).
 
@@ -181,12 +445,12 @@ def write_results_to_csv(results: list[TestResult], output_path: str | Path) ->
 
     try:
         with output_path.open("w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDNAMES)
-            writer.writeheader()
-
-            for result in results:
-                row = result.to_csv_row()
-                writer.writerow(row)
+            # Tuples in CSV_FIELDNAMES order skip DictWriter's per-row dict
+            # building and lookups, which add up over a full sweep
+            writer = csv.writer(csvfile)
+            writer.writerow(CSV_FIELDNAMES)
+            writer.writerows(result.to_csv_tuple() for result in results)
+        _clear_read_caches()
 
         logger.info("csv_written_successfully", path=str(output_path))
 
@@ -1,15 +1,134 @@
 """Google Gemini-based grading system for LLM responses."""
 
+import functools
 import json
-from typing import TypedDict
+import random
+import threading
+import time
+from typing import Any, TypedDict
 
-import google.generativeai as genai
+from pydantic_core import from_json
 
+from modelgrader.grade_cache import GradeCache
 from modelgrader.logging import get_logger
 from modelgrader.models import GradeBreakdown
+from modelgrader.ratelimit import TokenBucket, per_minute_bucket
 
 logger = get_logger(__name__)
 
+# Retry schedule for 429 (quota exhausted) responses from Gemini
+_MAX_ATTEMPTS = 5
+_BACKOFF_BASE = 1.0
+_BACKOFF_CAP = 60.0
+
+# Per-minute quotas set by configure_gemini; None means unlimited
+_rpm_limit: int | None = None
+_tpm_limit: int | None = None
+# Rate limiters per grading model, created on first use
+_buckets: dict[str, tuple[TokenBucket | None, TokenBucket | None]] = {}
+_buckets_lock = threading.Lock()
+# Cache of earlier grades set by configure_gemini; None disables caching
+_grade_cache: GradeCache | None = None
+# Seconds a Gemini request may take, set by configure_gemini; None keeps the
+# SDK default
+_request_timeout: float | None = None
+
+
+# Sections shared by the single and batch system instructions
+_GRADER_PREAMBLE = """You are a STRICT expert grader evaluating LLM responses about Red Hat Enterprise Linux system administration.
+
+CRITICAL INSTRUCTIONS:
+1. BE CRITICAL - Use the full range of scores to differentiate responses
+2. BE CONSISTENT - Apply the same standards to every response you grade
+3. CALIBRATE - Use the grading rubric precisely; same issues = same point deductions every time"""
+
+_GRADING_RUBRIC = """STRICT Grading scale (apply consistently to all responses):
+- Exceptional (rare): 85-100 - Perfect or near-perfect, comprehensive, zero issues
+- Very good: 70-84 - Solid response with minor room for improvement
+- Good/Adequate: 55-69 - Correct but lacking in some way (detail, examples, completeness)
+- Below average: 40-54 - Partially correct with notable gaps or minor errors
+- Poor: 20-39 - Significant errors or missing critical information
+- Severely deficient: 0-19 - Fundamentally wrong or unhelpful
+
+Grade each category independently using CONSISTENT criteria:
+
+1. ACCURACY (0-100): Does the response correctly address the user's question?
+   - ANY technical errors should result in score below 70
+   - Missing important caveats or warnings: deduct 10-15 points
+   - Outdated or non-RHEL-specific info: deduct 10-20 points
+   - Perfect accuracy with all edge cases covered: 85-100
+   - Correct but missing some nuance: 60-75
+   - Minor technical errors: 40-60
+   - Major technical errors: 0-40
+
+2. COMPLETENESS (0-100): Does the response provide a thorough answer?
+   - Score above 80 ONLY if ALL aspects covered thoroughly with examples
+   - Missing any significant aspect of the question: max 65
+   - Missing examples when they would be helpful: deduct 10 points
+   - Lacks context or explanation: deduct 10-15 points
+   - Partial answer only: max 50
+   - Superficial coverage: 30-50
+
+3. CLARITY (0-100): Is the response well-written and easy to understand?
+   - Score above 80 ONLY for exceptional organization and presentation
+   - Poor structure or hard to follow: max 60
+   - Lacks organization (no bullets, paragraphs, etc.): deduct 15 points
+   - Verbose or unclear language: deduct 10 points
+   - Missing helpful formatting: deduct 5-10 points
+   - Professional but not exceptional: 60-75
+
+CRITICAL GRADING RULES FOR CONSISTENCY:
+- Start by assuming a baseline of 70, then deduct points for any issues
+- Only exceptional responses with zero flaws should score above 85
+- If you're unsure between two scores, choose the LOWER one
+- Look for reasons to deduct points, not reasons to add them
+- Apply the EXACT SAME deductions for similar issues across all responses
+- Do not let earlier scores influence current grading - judge each response independently against the rubric
+- Be mechanical and systematic: same flaw = same point deduction, every time
+
+CONSISTENCY CHECKLIST:
+Before assigning scores, ask yourself:
+1. Am I applying the same severity of judgment as I would to any other response?
+2. Would I deduct the same points if I saw this exact issue in a different response?
+3. Am I being influenced by the overall quality, or grading each dimension independently?"""
+
+_SCORE_FIELDS = """- accuracy: integer score 0-100
+- completeness: integer score 0-100
+- clarity: integer score 0-100
+- explanation: brief justification (1-2 sentences) for the scores, explicitly noting what prevented higher scores and what specific deductions were applied"""
+
+_WEIGHTS_NOTE = """Note: These scores will be weighted as follows for the final grade:
+- Accuracy: 50%
+- Completeness: 25%
+- Clarity: 25%"""
+
+_SCALE_NOTE = """IMPORTANT: Scores above 85 should be RARE and only given to exceptional responses. Most good responses should fall in the 60-80 range."""
+
+# The rubric is sent as the system instruction, so every grading request
+# starts with the same text and only the question and response vary
+_SINGLE_SYSTEM_INSTRUCTION = f"""{_GRADER_PREAMBLE}
+
+You will be given an ORIGINAL QUESTION and a MODEL'S RESPONSE. Grade the response on a 100-point scale for each category. {_SCALE_NOTE}
+
+{_GRADING_RUBRIC}
+
+Provide your response as a JSON object with these fields:
+{_SCORE_FIELDS}
+
+{_WEIGHTS_NOTE}"""
+
+_BATCH_SYSTEM_INSTRUCTION = f"""{_GRADER_PREAMBLE}
+
+You will be given ITEMS, a JSON array in which each item has an id, an original question and a model's response to it. Grade every item on its own merits; never compare items with each other. Grade each response on a 100-point scale for each category. {_SCALE_NOTE}
+
+{_GRADING_RUBRIC}
+
+Provide your response as a JSON array with exactly one object per item, each with these fields:
+- id: the item's id, copied unchanged
+{_SCORE_FIELDS}
+
+{_WEIGHTS_NOTE}"""
+
 
 class GradingResponse(TypedDict):
     """Structured response schema for Gemini grading."""
@@ -20,14 +139,64 @@ class GradingResponse(TypedDict):
     explanation: str
 
 
-def configure_gemini(api_key: str) -> None:
+class BatchGradingResponse(GradingResponse):
+    """Structured response schema for one item of a batch grading."""
+
+    id: int
+
+
+# Score fields every grading reply must provide
+_SCORE_NAMES = ("accuracy", "completeness", "clarity")
+
+# Response schema and system instruction for each kind of grading request
+_MODEL_CONFIGS: dict[str, tuple[Any, str]] = {
+    "single": (GradingResponse, _SINGLE_SYSTEM_INSTRUCTION),
+    "batch": (list[BatchGradingResponse], _BATCH_SYSTEM_INSTRUCTION),
+}
+
+
+def configure_gemini(
+    api_key: str,
+    rpm: int | None = None,
+    tpm: int | None = None,
+    grade_cache: GradeCache | None = None,
+    request_timeout: float | None = None,
+) -> None:
     """Configure the Gemini API.
 
     Args:
         api_key: Google Gemini API key
+        rpm: Requests per minute allowed per grading model, or None for no limit
+        tpm: Input tokens per minute allowed per grading model, or None for no
+            limit
+        grade_cache: Cache to reuse grades for identical grading prompts, or
+            None to always call Gemini
+        request_timeout: Seconds a Gemini request may take, or None for the
+            SDK default
     """
+    global _rpm_limit, _tpm_limit, _grade_cache, _request_timeout
+
+    # Imported here: the SDK takes about half a second to import
+    import google.generativeai as genai
+
     genai.configure(api_key=api_key)  # type: ignore[attr-defined]
-    logger.info("gemini_configured")
+    # Cached models keep the client they were first used with
+    _get_model.cache_clear()
+
+    with _buckets_lock:
+        _rpm_limit = rpm
+        _tpm_limit = tpm
+        _buckets.clear()
+    _grade_cache = grade_cache
+    _request_timeout = request_timeout
+
+    logger.info(
+        "gemini_configured",
+        rpm=rpm,
+        tpm=tpm,
+        grade_cache=grade_cache is not None,
+        request_timeout=request_timeout,
+    )
 
 
 def grade_response(
@@ -60,47 +229,118 @@ def grade_response(
     # Create grading prompt (context not included in grading)
     grading_prompt = _create_grading_prompt(question, response)
 
+    cache = _grade_cache
+    cache_key = ""
+    if cache is not None:
+        cache_key = _cache_key(model_name, "single", grading_prompt)
+        if (cached := cache.get(cache_key)) is not None:
+            return cached
+
+    grades = _grade_prompt(grading_prompt, model_name)
+
+    if cache is not None:
+        cache.set(cache_key, grades)
+
+    return grades
+
+
+def grade_responses_batch(
+    items: list[tuple[str, str]],
+    model_name: str = "gemini-2.0-flash-exp",
+) -> list[GradeBreakdown]:
+    """Grade several LLM responses with a single Gemini request.
+
+    The rubric is sent once for the whole batch. Items already in the grade
+    cache are not sent at all. If Gemini's reply can't be matched to the items
+    (bad JSON, missing or unknown ids), the remaining items are graded one at
+    a time.
+
+    Args:
+        items: (question, response) pairs to grade
+        model_name: Gemini model to use for grading
+
+    Returns:
+        GradeBreakdowns in the same order as items
+    """
+    grading_prompts = [_create_grading_prompt(q, r) for q, r in items]
+    grades: list[GradeBreakdown | None] = [None] * len(items)
+    # Instruction each grade came from, so it is cached under the right key
+    schema_keys = ["batch"] * len(items)
+
+    cache = _grade_cache
+    if cache is not None:
+        # Only reuse grades made with the instruction this call would use
+        lookup_key = "batch" if len(items) > 1 else "single"
+        for i, grading_prompt in enumerate(grading_prompts):
+            grades[i] = cache.get(_cache_key(model_name, lookup_key, grading_prompt))
+
+    was_cached = [grade is not None for grade in grades]
+    pending = [i for i, cached in enumerate(was_cached) if not cached]
+    if len(pending) > 1:
+        # Imported here, like the SDK itself; google.api_core is slow to import
+        from google.api_core.exceptions import ResourceExhausted
+
+        logger.info("grading_batch", size=len(pending))
+        try:
+            batch_prompt = _create_batch_grading_prompt([items[i] for i in pending])
+            result = _generate_with_retry(model_name, "batch", batch_prompt)
+            text = result.text  # type: ignore[attr-defined]
+            grading_data = from_json(text)
+
+            by_id = {item["id"]: item for item in grading_data}
+            if sorted(by_id) != list(range(len(pending))):
+                raise ValueError(
+                    f"expected ids 0-{len(pending) - 1}, got {sorted(by_id)}"
+                )
+
+            for batch_id, i in enumerate(pending):
+                grades[i] = _grades_from_payload(by_id[batch_id], text)
+
+            logger.info("batch_grading_complete", size=len(pending))
+
+        except ResourceExhausted:
+            # Retries are already exhausted; grading one by one would only
+            # send more requests into the same quota
+            raise
+        except Exception as e:
+            logger.warning("batch_grading_failed", size=len(pending), error=str(e))
+
+    results = []
+    for i, grade in enumerate(grades):
+        if grade is None:
+            # Not covered by the batch reply, or the only item to grade
+            grade = _grade_prompt(grading_prompts[i], model_name)
+            schema_keys[i] = "single"
+        if cache is not None and not was_cached[i]:
+            cache.set(_cache_key(model_name, schema_keys[i], grading_prompts[i]), grade)
+        results.append(grade)
+
+    return results
+
+
+def _grade_prompt(grading_prompt: str, model_name: str) -> GradeBreakdown:
+    """Send a single grading prompt to Gemini and parse the grades.
+
+    Args:
+        grading_prompt: Prompt from _create_grading_prompt
+        model_name: Gemini model to use for grading
+
+    Returns:
+        GradeBreakdown with scores
+    """
     try:
         # Use Gemini to grade the response with structured output
-        model = genai.GenerativeModel(  # type: ignore[attr-defined]
-            model_name,
-            generation_config={  # type: ignore[arg-type]
-                "response_mime_type": "application/json",
-                "response_schema": GradingResponse,
-            },
-        )
-        result = model.generate_content(grading_prompt)  # type: ignore[attr-defined]
+        result = _generate_with_retry(model_name, "single", grading_prompt)
 
-        # Parse JSON response directly
-        grading_data = json.loads(result.text)  # type: ignore[attr-defined]
+        # Parse JSON response directly. result.text re-joins the reply's parts
+        # on every access, so read it once; pydantic-core's parser is several
+        # times faster than json.loads on these small payloads.
+        text = result.text  # type: ignore[attr-defined]
+        grading_data = from_json(text)
 
         logger.debug("parsed_grading_data", data=grading_data)
 
-        # Validate required fields are present
-        required_fields = ["accuracy", "completeness", "clarity"]
-        missing_fields = [f for f in required_fields if f not in grading_data]
-        if missing_fields:
-            logger.warning(
-                "missing_required_fields",
-                fields=missing_fields,
-                response=result.text[:500],  # type: ignore[attr-defined]
-                available_keys=list(grading_data.keys()),
-            )
-            # Provide default values for missing fields
-            for field in missing_fields:
-                grading_data[field] = 50  # Default to middle score
-
-        # Validate and clamp scores
-        accuracy = min(100, max(0, int(grading_data.get("accuracy", 50))))
-        completeness = min(100, max(0, int(grading_data.get("completeness", 50))))
-        clarity = min(100, max(0, int(grading_data.get("clarity", 50))))
-
-        grades = GradeBreakdown(
-            accuracy=accuracy,
-            completeness=completeness,
-            clarity=clarity,
-            explanation=grading_data.get("explanation", "No explanation provided."),
-        )
+        grades = _grades_from_payload(grading_data, text)
 
         logger.info(
             "grading_complete",
@@ -117,90 +357,194 @@ def grade_response(
         raise
 
 
-def _create_grading_prompt(question: str, response: str) -> str:
-    """Create a detailed grading prompt for Gemini.
+def _grades_from_payload(grading_data: dict[str, Any], raw_text: str) -> GradeBreakdown:
+    """Validate a parsed grading reply and turn it into a GradeBreakdown.
+
+    Missing scores default to 50 and all scores are clamped to 0-100. The
+    parsed data is not modified.
 
     Args:
-        question: The original question
-        response: The model's response
+        grading_data: Parsed JSON object for one graded response
+        raw_text: Raw reply text, logged when fields are missing
 
     Returns:
-        Formatted grading prompt
+        GradeBreakdown with scores
     """
-    return f"""You are a STRICT expert grader evaluating LLM responses about Red Hat Enterprise Linux system administration.
+    # Check, default and clamp every score in a single pass over the fields
+    scores: dict[str, int] = {}
+    missing_fields = []
+    for field in _SCORE_NAMES:
+        value = grading_data.get(field)
+        if value is None:
+            missing_fields.append(field)
+            value = 50  # Default to middle score
+        scores[field] = min(max(int(value), 0), 100)
+
+    if missing_fields:
+        logger.warning(
+            "missing_required_fields",
+            fields=missing_fields,
+            response=raw_text[:500],
+            available_keys=list(grading_data.keys()),
+        )
 
-CRITICAL INSTRUCTIONS:
-1. BE CRITICAL - Use the full range of scores to differentiate responses
-2. BE CONSISTENT - Apply the same standards to every response you grade
-3. CALIBRATE - Use the grading rubric precisely; same issues = same point deductions every time
+    return GradeBreakdown(
+        **scores,
+        explanation=grading_data.get("explanation", "No explanation provided."),
+    )
 
-ORIGINAL QUESTION:
-{question}
 
-MODEL'S RESPONSE:
-{response}
+@functools.lru_cache(maxsize=8)
+def _get_model(model_name: str, schema_key: str) -> Any:
+    """Return a shared GenerativeModel for structured grading.
 
-Grade this response on a 100-point scale for each category. IMPORTANT: Scores above 85 should be RARE and only given to exceptional responses. Most good responses should fall in the 60-80 range.
+    Building a model converts the response schema each time, and the model
+    holds on to its API client after the first call, so one instance per
+    (model, schema) is reused across all grading calls.
 
-STRICT Grading scale (apply consistently to all responses):
-- Exceptional (rare): 85-100 - Perfect or near-perfect, comprehensive, zero issues
-- Very good: 70-84 - Solid response with minor room for improvement
-- Good/Adequate: 55-69 - Correct but lacking in some way (detail, examples, completeness)
-- Below average: 40-54 - Partially correct with notable gaps or minor errors
-- Poor: 20-39 - Significant errors or missing critical information
-- Severely deficient: 0-19 - Fundamentally wrong or unhelpful
+    Args:
+        model_name: Gemini model name
+        schema_key: "single" for one GradingResponse, "batch" for a list of
+            BatchGradingResponse
 
-Grade each category independently using CONSISTENT criteria:
+    Returns:
+        Gemini GenerativeModel
+    """
+    import google.generativeai as genai
+
+    response_schema, system_instruction = _MODEL_CONFIGS[schema_key]
+    return genai.GenerativeModel(  # type: ignore[attr-defined]
+        model_name,
+        system_instruction=system_instruction,
+        generation_config={  # type: ignore[arg-type]
+            "response_mime_type": "application/json",
+            "response_schema": response_schema,
+        },
+    )
 
-1. ACCURACY (0-100): Does the response correctly address the user's question?
-   - ANY technical errors should result in score below 70
-   - Missing important caveats or warnings: deduct 10-15 points
-   - Outdated or non-RHEL-specific info: deduct 10-20 points
-   - Perfect accuracy with all edge cases covered: 85-100
-   - Correct but missing some nuance: 60-75
-   - Minor technical errors: 40-60
-   - Major technical errors: 0-40
 
-2. COMPLETENESS (0-100): Does the response provide a thorough answer?
-   - Score above 80 ONLY if ALL aspects covered thoroughly with examples
-   - Missing any significant aspect of the question: max 65
-   - Missing examples when they would be helpful: deduct 10 points
-   - Lacks context or explanation: deduct 10-15 points
-   - Partial answer only: max 50
-   - Superficial coverage: 30-50
+def _cache_key(model_name: str, schema_key: str, grading_prompt: str) -> str:
+    """Build the grade cache key for one graded item.
 
-3. CLARITY (0-100): Is the response well-written and easy to understand?
-   - Score above 80 ONLY for exceptional organization and presentation
-   - Poor structure or hard to follow: max 60
-   - Lacks organization (no bullets, paragraphs, etc.): deduct 15 points
-   - Verbose or unclear language: deduct 10 points
-   - Missing helpful formatting: deduct 5-10 points
-   - Professional but not exceptional: 60-75
+    Batch and single grades use different system instructions, so the same
+    prompt gets a different key depending on which one produced the grade.
 
-CRITICAL GRADING RULES FOR CONSISTENCY:
-- Start by assuming a baseline of 70, then deduct points for any issues
-- Only exceptional responses with zero flaws should score above 85
-- If you're unsure between two scores, choose the LOWER one
-- Look for reasons to deduct points, not reasons to add them
-- Apply the EXACT SAME deductions for similar issues across all responses
-- Do not let earlier scores influence current grading - judge each response independently against the rubric
-- Be mechanical and systematic: same flaw = same point deduction, every time
+    Args:
+        model_name: Gemini model name
+        schema_key: "single" or "batch", the instruction the grade came from
+        grading_prompt: Prompt from _create_grading_prompt
 
-CONSISTENCY CHECKLIST:
-Before assigning scores, ask yourself:
-1. Am I applying the same severity of judgment as I would to any other response?
-2. Would I deduct the same points if I saw this exact issue in a different response?
-3. Am I being influenced by the overall quality, or grading each dimension independently?
+    Returns:
+        Cache key covering the system instruction and the prompt
+    """
+    _, system_instruction = _MODEL_CONFIGS[schema_key]
+    return GradeCache.make_key(model_name, f"{system_instruction}\n\n{grading_prompt}")
 
-Provide your response as a JSON object with these fields:
-- accuracy: integer score 0-100
-- completeness: integer score 0-100
-- clarity: integer score 0-100
-- explanation: brief justification (1-2 sentences) for the scores, explicitly noting what prevented higher scores and what specific deductions were applied
 
-Note: These scores will be weighted as follows for the final grade:
-- Accuracy: 50%
-- Completeness: 25%
-- Clarity: 25%"""
+def _get_buckets(model_name: str) -> tuple[TokenBucket | None, TokenBucket | None]:
+    """Return the (requests, tokens) rate limiters for a grading model.
+
+    Args:
+        model_name: Gemini model name
 
+    Returns:
+        Request and token buckets; either is None when that quota is unlimited
+    """
+    with _buckets_lock:
+        buckets = _buckets.get(model_name)
+        if buckets is None:
+            buckets = (
+                per_minute_bucket(_rpm_limit) if _rpm_limit else None,
+                per_minute_bucket(_tpm_limit) if _tpm_limit else None,
+            )
+            _buckets[model_name] = buckets
+        return buckets
 
+
+def _generate_with_retry(model_name: str, schema_key: str, prompt: str) -> Any:
+    """Call generate_content within the configured quota, retrying on 429s.
+
+    Args:
+        model_name: Gemini model name
+        schema_key: Kind of grading request, as for _get_model
+        prompt: Prompt to send
+
+    Returns:
+        Gemini response
+    """
+    from google.api_core.exceptions import ResourceExhausted
+
+    model = _get_model(model_name, schema_key)
+    request_bucket, token_bucket = _get_buckets(model_name)
+    # Roughly four characters per token; only used for pacing. The system
+    # instruction is billed as input on every request too.
+    _, system_instruction = _MODEL_CONFIGS[schema_key]
+    estimated_tokens = (len(system_instruction) + len(prompt)) / 4
+    request_options = {"timeout": _request_timeout} if _request_timeout else None
+
+    attempt = 1
+    while True:
+        if request_bucket:
+            request_bucket.acquire()
+        if token_bucket:
+            token_bucket.acquire(estimated_tokens)
+
+        try:
+            return model.generate_content(prompt, request_options=request_options)
+        except ResourceExhausted as e:
+            if attempt >= _MAX_ATTEMPTS:
+                raise
+            # Exponential backoff with full jitter
+            delay = random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2**attempt))
+            logger.warning(
+                "gemini_quota_exhausted",
+                attempt=attempt,
+                retry_in=round(delay, 2),
+                error=str(e),
+            )
+            time.sleep(delay)
+            attempt += 1
+
+
+def _create_grading_prompt(question: str, response: str) -> str:
+    """Create the grading prompt for one response.
+
+    The rubric is in _SINGLE_SYSTEM_INSTRUCTION; the prompt only carries the
+    question and response being graded.
+
+    Args:
+        question: The original question
+        response: The model's response
+
+    Returns:
+        Formatted grading prompt
+    """
+    return f"""ORIGINAL QUESTION:
+{question}
+
+MODEL'S RESPONSE:
+{response}"""
+
+
+def _create_batch_grading_prompt(items: list[tuple[str, str]]) -> str:
+    """Create one grading prompt covering several responses.
+
+    The rubric is in _BATCH_SYSTEM_INSTRUCTION; the prompt only carries the
+    items being graded.
+
+    Args:
+        items: (question, response) pairs; each is referred to by its index
+
+    Returns:
+        Formatted grading prompt listing the items as JSON
+    """
+    payload = json.dumps(
+        [
+            {"id": i, "question": question, "response": response}
+            for i, (question, response) in enumerate(items)
+        ],
+        ensure_ascii=False,
+        indent=2,
+    )
+    return f"""ITEMS:
+{payload}"""
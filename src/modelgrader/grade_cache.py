@@ -0,0 +1,99 @@
+"""Persistent cache of Gemini grades keyed on the grading prompt."""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+
+from modelgrader.logging import get_logger
+from modelgrader.models import GradeBreakdown
+
+logger = get_logger(__name__)
+
+
+class GradeCache:
+    """SQLite-backed cache mapping a grading request to its GradeBreakdown.
+
+    Keys are content hashes of the grading model and the full grading prompt,
+    so a changed question, response or rubric never hits a stale entry. The
+    cache is shared by the worker threads that grade responses.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Open (or create) the cache database.
+
+        Args:
+            path: Path to the SQLite database file; ``~`` is expanded
+        """
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS grades (key TEXT PRIMARY KEY, grades TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        logger.info("grade_cache_opened", path=str(self.path))
+
+    @staticmethod
+    def make_key(model_name: str, grading_prompt: str) -> str:
+        """Build the cache key for a grading request.
+
+        Args:
+            model_name: Gemini model used for grading
+            grading_prompt: Full prompt sent to Gemini
+
+        Returns:
+            Hex SHA-256 digest identifying the request
+        """
+        return hashlib.sha256(f"{model_name}\0{grading_prompt}".encode()).hexdigest()
+
+    def get(self, key: str) -> GradeBreakdown | None:
+        """Look up cached grades.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Cached grades, or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT grades FROM grades WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if row is None:
+            logger.debug("grade_cache_miss", key=key[:12])
+            return None
+
+        logger.debug("grade_cache_hit", key=key[:12])
+        return GradeBreakdown.model_validate_json(row[0])
+
+    def set(self, key: str, grades: GradeBreakdown) -> None:
+        """Store grades for a request.
+
+        Args:
+            key: Key from make_key
+            grades: Grades to cache
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO grades (key, grades) VALUES (?, ?)",
+                (key, grades.model_dump_json()),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database and log hit/miss counts."""
+        with self._lock:
+            self._conn.close()
+        logger.info(
+            "grade_cache_closed", path=str(self.path), hits=self.hits, misses=self.misses
+        )
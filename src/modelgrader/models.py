@@ -1,8 +1,9 @@
 """Data models for the LLM grading system."""
 
+import functools
 from pathlib import Path
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class Question(BaseModel):
@@ -18,14 +19,41 @@ class Question(BaseModel):
         Returns:
             Context text or empty string if no context
         """
-        if self.context_path and self.context_path.exists():
-            return self.context_path.read_text(encoding="utf-8")
-        return ""
+        if not self.context_path:
+            return ""
+
+        try:
+            stat = self.context_path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            return ""
+
+        return _read_context(self.context_path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=128)
+def _read_context(path: Path, mtime_ns: int, size: int) -> str:
+    """Read a context file, memoized so each file is read once per run.
+
+    The modification time and size are only part of the cache key, so an
+    edited file is read again.
+
+    Args:
+        path: Path to context file
+        mtime_ns: File modification time in nanoseconds
+        size: File size in bytes
+
+    Returns:
+        Context text
+    """
+    return path.read_text(encoding="utf-8")
 
 
 class GradeBreakdown(BaseModel):
     """Breakdown of grades for a response (absolute scores 0-100)."""
 
+    # Grades don't change once Gemini returns them; use model_copy to adjust
+    model_config = ConfigDict(frozen=True)
+
     accuracy: int = Field(
         ...,
         ge=0,
@@ -58,12 +86,9 @@ class GradeBreakdown(BaseModel):
         Returns:
             Weighted score (0-100)
         """
-        return round(
-            (self.accuracy * 0.5)
-            + (self.completeness * 0.25)
-            + (self.clarity * 0.25),
-            2,
-        )
+        # Integer percentages divided once: scores are whole numbers, so the
+        # result is a multiple of 0.25 and exact without rounding
+        return (self.accuracy * 50 + self.completeness * 25 + self.clarity * 25) / 100
 
     # Maintain backward compatibility with 'total' property
     @property
@@ -112,6 +137,25 @@ class TestResult(BaseModel):
             "Explanation": self.grades.explanation,
         }
 
+    def to_csv_tuple(self) -> tuple[str | int | float, ...]:
+        """Convert to CSV row values, in the same column order as to_csv_row.
+
+        Returns:
+            Tuple suitable for csv.writer
+        """
+        return (
+            self.model_name,
+            f"Q{self.question_number}",
+            "Yes" if self.context_provided else "No",
+            self.grades.accuracy,
+            self.grades.completeness,
+            self.grades.clarity,
+            round(self.response_time, 2),
+            self.total_score,
+            round(self.percentile, 1),
+            self.grades.explanation,
+        )
+
 
 def calculate_percentiles(results: list[TestResult]) -> list[TestResult]:
     """Calculate percentile ranks for all results based on weighted scores.
@@ -0,0 +1,79 @@
+"""Client-side rate limiting for API calls."""
+
+import threading
+from time import monotonic, sleep
+
+from modelgrader.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that paces callers to a sustained rate.
+
+    Tokens refill continuously at ``rate_per_sec`` up to ``burst``. Callers
+    reserve tokens up front and sleep off any shortfall outside the lock, so
+    waiting threads are released in the order they arrived.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: float) -> None:
+        """Create a full bucket.
+
+        Args:
+            rate_per_sec: Tokens added per second
+            burst: Maximum number of tokens the bucket holds
+        """
+        if rate_per_sec <= 0 or burst <= 0:
+            raise ValueError("rate_per_sec and burst must be positive")
+
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self._tokens = burst
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cost: float = 1.0) -> float:
+        """Take tokens from the bucket, blocking until they are available.
+
+        Args:
+            cost: Number of tokens to take; capped at the bucket size so a
+                single large request can't wait forever
+
+        Returns:
+            Seconds spent waiting
+        """
+        cost = min(cost, self.burst)
+
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate_per_sec
+            )
+            self._updated = now
+            # Going negative reserves tokens that later callers must wait for
+            self._tokens -= cost
+            wait = -self._tokens / self.rate_per_sec if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            logger.debug("rate_limited", wait=round(wait, 2), cost=cost)
+            sleep(wait)
+
+        return wait
+
+
+def per_minute_bucket(limit_per_minute: int) -> TokenBucket:
+    """Create a bucket for a per-minute quota such as RPM or TPM.
+
+    The burst is a tenth of the quota, so a cold start can't spend most of a
+    minute's allowance in the first second.
+
+    Args:
+        limit_per_minute: Allowed units per minute
+
+    Returns:
+        TokenBucket that refills at the quota's rate
+    """
+    return TokenBucket(
+        rate_per_sec=limit_per_minute / 60,
+        burst=max(1, limit_per_minute // 10),
+    )
@@ -1,18 +1,33 @@
 """Test orchestration for running all LLM tests."""
 
-from pathlib import Path
+from __future__ import annotations
 
-from ibm_watsonx_ai import APIClient
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from modelgrader.gemini_grader import grade_response
+from modelgrader.gemini_grader import grade_response, grade_responses_batch
 from modelgrader.logging import get_logger
-from modelgrader.models import Question, TestResult
-from modelgrader.watsonx_client import create_prompt, query_model
+from modelgrader.models import GradeBreakdown, Question, TestResult
+from modelgrader.watsonx_client import create_prompt, query_model, query_model_batch
+
+if TYPE_CHECKING:
+    from ibm_watsonx_ai import APIClient
 
 logger = get_logger(__name__)
 
+# Number of responses graded together in one Gemini request
+GRADE_BATCH_SIZE = 8
 
-def load_questions(questions_dir: str | Path, contexts_dir: str | Path) -> list[Question]:
+# Worker threads used to read context files when preloading them
+CONTEXT_READ_WORKERS = 8
+
+
+def load_questions(
+    questions_dir: str | Path, contexts_dir: str | Path
+) -> list[Question]:
     """Load questions and their corresponding contexts.
 
     Args:
@@ -31,32 +46,79 @@ def load_questions(questions_dir: str | Path, contexts_dir: str | Path) -> list[
     if not contexts_path.exists():
         raise FileNotFoundError(f"Contexts directory not found: {contexts_path}")
 
-    # Get all question files (sorted by number)
-    question_files = sorted(questions_path.glob("question_*.txt"))
+    # List the context directory once instead of checking each file exists
+    context_names = set(os.listdir(contexts_path))
 
     questions = []
-    for question_file in question_files:
-        # Extract question number from filename (e.g., "question_1.txt" -> 1)
-        number = int(question_file.stem.split("_")[1])
-
-        # Read question text
-        question_text = question_file.read_text(encoding="utf-8").strip()
-
-        # Find corresponding context file
-        context_file = contexts_path / f"context_{number}.txt"
-
-        questions.append(
-            Question(
-                number=number,
-                text=question_text,
-                context_path=context_file if context_file.exists() else None,
+    with os.scandir(questions_path) as entries:
+        for entry in entries:
+            name = entry.name
+            if not (name.startswith("question_") and name.endswith(".txt")):
+                continue
+
+            # Extract question number from filename (e.g., "question_1.txt" -> 1)
+            number_text = name[len("question_") : -len(".txt")]
+            if not number_text.isdecimal():
+                continue
+            number = int(number_text)
+
+            # Read question text
+            question_text = Path(entry.path).read_text(encoding="utf-8").strip()
+
+            # Find corresponding context file
+            context_name = f"context_{number}.txt"
+
+            questions.append(
+                Question(
+                    number=number,
+                    text=question_text,
+                    context_path=contexts_path / context_name
+                    if context_name in context_names
+                    else None,
+                )
             )
-        )
+
+    # Sort by question number
+    questions.sort(key=lambda q: q.number)
 
     logger.info("questions_loaded", count=len(questions))
     return questions
 
 
+def preload_contexts(questions: list[Question]) -> None:
+    """Read the questions' context files up front, several at a time.
+
+    Later load_context calls are then served from its cache.
+
+    Args:
+        questions: Questions whose contexts to read
+    """
+    if not questions:
+        return
+
+    # File reads release the GIL, so the reads overlap
+    workers = min(CONTEXT_READ_WORKERS, len(questions))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(Question.load_context, questions))
+
+
+def build_prompt(question: Question, with_context: bool) -> tuple[str | None, str]:
+    """Build the model prompt for a question.
+
+    The prompt only depends on the question and whether context is included,
+    so callers testing many models can build it once and reuse it.
+
+    Args:
+        question: Question to ask
+        with_context: Whether to include context
+
+    Returns:
+        Tuple of (context text or None, prompt)
+    """
+    context = question.load_context() if with_context else None
+    return context, create_prompt(question.text, context)
+
+
 def run_single_test(
     client: APIClient,
     model_id: str,
@@ -74,8 +136,7 @@ def run_single_test(
     Returns:
         TestResult with grades
     """
-    context = question.load_context() if with_context else None
-    prompt = create_prompt(question.text, context)
+    context, prompt = build_prompt(question, with_context)
 
     logger.info(
         "running_test",
@@ -87,6 +148,121 @@ def run_single_test(
     # Query the model
     response, response_time = query_model(client, model_id, prompt)
 
+    return _grade_result(
+        model_id=model_id,
+        question=question,
+        with_context=with_context,
+        context=context,
+        response=response,
+        response_time=response_time,
+    )
+
+
+def grade_batch_responses(
+    model_id: str,
+    questions: list[Question],
+    with_context: bool,
+    responses: list[tuple[str, float] | Exception],
+) -> list[TestResult | Exception]:
+    """Grade one model's responses to several questions.
+
+    A failure only costs the questions it hit: failed queries are passed
+    through without grading, and a chunk whose grading fails is graded again
+    one response at a time.
+
+    Args:
+        model_id: Model ID that produced the responses
+        questions: Questions that were asked
+        with_context: Whether context was included
+        responses: (response, response_time) pair or the query's exception,
+            one per question, as returned by query_model_batch
+
+    Returns:
+        TestResult or the exception that stopped it, for each question in
+        question order
+    """
+    answered = [
+        (i, response)
+        for i, response in enumerate(responses)
+        if not isinstance(response, Exception)
+    ]
+
+    # Grade the responses a few at a time, one Gemini request per chunk
+    graded: dict[int, TestResult | Exception] = {}
+    for start in range(0, len(answered), GRADE_BATCH_SIZE):
+        chunk = answered[start : start + GRADE_BATCH_SIZE]
+        chunk_grades = _grade_chunk([
+            (questions[i].text, response) for i, (response, _) in chunk
+        ])
+        for (i, (response, response_time)), grades in zip(chunk, chunk_grades):
+            graded[i] = (
+                grades
+                if isinstance(grades, Exception)
+                else _build_result(
+                    model_id=model_id,
+                    question=questions[i],
+                    with_context=with_context,
+                    response=response,
+                    response_time=response_time,
+                    grades=grades,
+                )
+            )
+
+    return [
+        response if isinstance(response, Exception) else graded[i]
+        for i, response in enumerate(responses)
+    ]
+
+
+def _grade_chunk(items: list[tuple[str, str]]) -> list[GradeBreakdown | Exception]:
+    """Grade a chunk of responses, keeping a failure to the items it hit.
+
+    Args:
+        items: (question, response) pairs to grade
+
+    Returns:
+        GradeBreakdown or the grading exception, for each item in order
+    """
+    # Imported here, like the Gemini SDK; google.api_core is slow to import
+    from google.api_core.exceptions import ResourceExhausted
+
+    grades: list[GradeBreakdown | Exception] = []
+    try:
+        grades.extend(grade_responses_batch(items))
+    except ResourceExhausted as e:
+        # Retries are already exhausted; grading the items one by one would
+        # only send more requests into the same quota
+        grades = [e] * len(items)
+    except Exception as e:
+        if len(items) == 1:
+            return [e]
+        logger.warning("grade_chunk_failed", size=len(items), error=str(e))
+        for item in items:
+            grades.extend(_grade_chunk([item]))
+    return grades
+
+
+def _grade_result(
+    model_id: str,
+    question: Question,
+    with_context: bool,
+    context: str | None,
+    response: str,
+    response_time: float,
+) -> TestResult:
+    """Grade a model response and wrap it in a TestResult.
+
+    Args:
+        model_id: Model ID that produced the response
+        question: Question that was asked
+        with_context: Whether context was included
+        context: Context that was included, if any
+        response: The model's response
+        response_time: Time taken to generate the response
+
+    Returns:
+        TestResult with grades
+    """
     # Grade the response
     grades = grade_response(
         question=question.text,
@@ -95,7 +271,37 @@ def run_single_test(
         response_time=response_time,
     )
 
-    # Create result
+    return _build_result(
+        model_id=model_id,
+        question=question,
+        with_context=with_context,
+        response=response,
+        response_time=response_time,
+        grades=grades,
+    )
+
+
+def _build_result(
+    model_id: str,
+    question: Question,
+    with_context: bool,
+    response: str,
+    response_time: float,
+    grades: GradeBreakdown,
+) -> TestResult:
+    """Wrap a graded model response in a TestResult.
+
+    Args:
+        model_id: Model ID that produced the response
+        question: Question that was asked
+        with_context: Whether context was included
+        response: The model's response
+        response_time: Time taken to generate the response
+        grades: Grades for the response
+
+    Returns:
+        TestResult with grades
+    """
     result = TestResult(
         model_name=model_id,
         question_number=question.number,
@@ -117,68 +323,176 @@ def run_single_test(
     return result
 
 
-def run_all_tests(
+async def query_batch_async(
+    client: APIClient,
+    model_id: str,
+    prompts: list[str],
+    max_concurrency: int = 1,
+) -> list[tuple[str, float] | Exception]:
+    """Query one model with several prompts without blocking the event loop.
+
+    Args:
+        client: WatsonX API client
+        model_id: Model ID to query
+        prompts: Prompts to send
+        max_concurrency: Maximum number of prompts sent at the same time
+
+    Returns:
+        (response, response_time) pair or the query's exception, for each
+        prompt in prompt order
+    """
+    return await asyncio.to_thread(
+        query_model_batch, client, model_id, prompts, max_concurrency=max_concurrency
+    )
+
+
+async def grade_batch_responses_async(
+    model_id: str,
+    questions: list[Question],
+    with_context: bool,
+    responses: list[tuple[str, float] | Exception],
+) -> list[TestResult | Exception]:
+    """Grade one model's responses without blocking the event loop.
+
+    Args:
+        model_id: Model ID that produced the responses
+        questions: Questions that were asked
+        with_context: Whether context was included
+        responses: (response, response_time) pair or the query's exception,
+            one per question
+
+    Returns:
+        TestResult or the exception that stopped it, for each question in
+        question order
+    """
+    return await asyncio.to_thread(
+        grade_batch_responses, model_id, questions, with_context, responses
+    )
+
+
+async def run_single_test_async(
+    client: APIClient,
+    model_id: str,
+    question: Question,
+    with_context: bool,
+) -> TestResult:
+    """Run a single test without blocking the event loop.
+
+    The WatsonX and Gemini SDK calls are synchronous, so the test runs in a
+    worker thread and many tests can wait on the network at the same time.
+
+    Args:
+        client: WatsonX API client
+        model_id: Model ID to test
+        question: Question to ask
+        with_context: Whether to include context
+
+    Returns:
+        TestResult with grades
+    """
+    return await asyncio.to_thread(
+        run_single_test,
+        client=client,
+        model_id=model_id,
+        question=question,
+        with_context=with_context,
+    )
+
+
+async def run_all_tests_async(
     client: APIClient,
     model_ids: list[str],
     questions: list[Question],
+    max_concurrency: int = 20,
 ) -> list[TestResult]:
-    """Run all tests for all models and questions.
+    """Run all tests for all models and questions concurrently.
 
     Args:
         client: WatsonX API client
         model_ids: List of model IDs to test
         questions: List of questions to ask
+        max_concurrency: Maximum number of tests in flight at once
 
     Returns:
-        List of all test results
+        List of all successful test results, in model/question/context order
     """
-    results = []
-    total_tests = len(model_ids) * len(questions) * 2  # x2 for with/without context
+    combinations = [
+        (model_id, question, with_context)
+        for model_id in model_ids
+        for question in questions
+        for with_context in (False, True)
+    ]
 
     logger.info(
         "starting_all_tests",
         model_count=len(model_ids),
         question_count=len(questions),
-        total_tests=total_tests,
+        total_tests=len(combinations),
+        max_concurrency=max_concurrency,
     )
 
-    for model_id in model_ids:
-        for question in questions:
-            # Test without context
-            try:
-                result = run_single_test(
-                    client=client,
-                    model_id=model_id,
-                    question=question,
-                    with_context=False,
-                )
-                results.append(result)
-            except Exception as e:
-                logger.error(
-                    "test_failed",
-                    model_id=model_id,
-                    question_number=question.number,
-                    with_context=False,
-                    error=str(e),
-                )
+    semaphore = asyncio.Semaphore(max_concurrency)
 
-            # Test with context
-            try:
-                result = run_single_test(
-                    client=client,
-                    model_id=model_id,
-                    question=question,
-                    with_context=True,
-                )
-                results.append(result)
-            except Exception as e:
-                logger.error(
-                    "test_failed",
-                    model_id=model_id,
-                    question_number=question.number,
-                    with_context=True,
-                    error=str(e),
-                )
+    async def _run(model_id: str, question: Question, with_context: bool) -> TestResult:
+        async with semaphore:
+            return await run_single_test_async(
+                client=client,
+                model_id=model_id,
+                question=question,
+                with_context=with_context,
+            )
+
+    outcomes = await asyncio.gather(
+        *(_run(*combination) for combination in combinations),
+        return_exceptions=True,
+    )
+
+    results = []
+    for (model_id, question, with_context), outcome in zip(combinations, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error(
+                "test_failed",
+                model_id=model_id,
+                question_number=question.number,
+                with_context=with_context,
+                error=str(outcome),
+            )
+        else:
+            results.append(outcome)
 
     logger.info("all_tests_complete", results_count=len(results))
     return results
+
+
+def run_all_tests(
+    client: APIClient,
+    model_ids: list[str],
+    questions: list[Question],
+    max_concurrency: int = 20,
+) -> list[TestResult]:
+    """Run all tests for all models and questions.
+
+    Blocking entry point for run_all_tests_async; must not be called from a
+    running event loop.
+
+    Args:
+        client: WatsonX API client
+        model_ids: List of model IDs to test
+        questions: List of questions to ask
+        max_concurrency: Maximum number of tests in flight at once
+
+    Returns:
+        List of all test results
+    """
+
+    async def _main() -> list[TestResult]:
+        # Tests run in worker threads, so size the pool to the concurrency
+        # limit rather than the default of a few threads per CPU
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=max_concurrency)
+        )
+        return await run_all_tests_async(
+            client, model_ids, questions, max_concurrency=max_concurrency
+        )
+
+    return asyncio.run(_main())
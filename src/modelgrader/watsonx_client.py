@@ -1,30 +1,102 @@
-"""IBM WatsonX client for listing and querying models."""
+"""IBM WatsonX client for listing and querying models.
 
+The ibm_watsonx_ai SDK takes about a second to import (ModelInference pulls
+in pandas), so it is imported where a client or inference is first built
+rather than when this module is loaded.
+"""
+
+from __future__ import annotations
+
+import functools
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 
-from ibm_watsonx_ai import APIClient, Credentials
-from ibm_watsonx_ai.foundation_models.inference import ModelInference
-from ibm_watsonx_ai.metanames import GenTextParamsMetaNames as GenParams
+import httpx
 
 from modelgrader.logging import get_logger
 
-logger = get_logger(__name__)
+if TYPE_CHECKING:
+    from ibm_watsonx_ai import APIClient
+    from ibm_watsonx_ai.foundation_models.inference import ModelInference
 
+logger = get_logger(__name__)
 
-def create_watsonx_client(api_key: str, project_id: str, url: str) -> APIClient:
+# Seconds an idle pooled connection is kept open. The SDK default of 5s
+# drops connections between a model's batches, costing a new TLS handshake.
+KEEPALIVE_EXPIRY = 30.0
+
+# Backoff for network errors the SDK doesn't retry. Its transport already
+# retries 429/503/504/520 responses and RemoteProtocolError (a server
+# closing a stale keep-alive connection), but re-raises timeouts and
+# connection errors on the first attempt.
+_RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.NetworkError)
+_BACKOFF_BASE = 1.0
+_BACKOFF_CAP = 30.0
+
+# Task and function IDs that mark a model as chat-capable
+_CHAT_TASKS = frozenset({"chat", "question_answering"})
+_CHAT_FUNCTIONS = frozenset({"chat", "text_chat"})
+
+# Substrings of model IDs that mark vision/image models
+_VISUAL_TOKENS = (
+    "vision",
+    "visual",
+    "image",
+    "vlm",  # Vision-Language Model
+    "clip",
+    "vit",  # Vision Transformer
+)
+# Substrings of model IDs for guardian, llama-3-405b and code-instruct models
+_EXCLUDED_TOKENS = ("guardian", "llama-3-405b", "code-instruct")
+
+
+def create_watsonx_client(
+    api_key: str,
+    project_id: str,
+    url: str,
+    max_connections: int = 10,
+    timeout: float = 120.0,
+) -> APIClient:
     """Create and return a WatsonX API client.
 
+    Every ModelInference built from the client shares its pooled httpx
+    client, so connections are reused across models and questions.
+
     Args:
         api_key: IBM WatsonX API key
         project_id: WatsonX project ID
         url: WatsonX API URL
+        max_connections: Size of the connection pool; set to the number of
+            concurrent queries so no query waits for a free connection
+        timeout: Seconds an HTTP request may wait to connect or for data; the
+            SDK default is 30 minutes
 
     Returns:
         Configured APIClient instance
     """
+    from ibm_watsonx_ai import APIClient, Credentials
+    from ibm_watsonx_ai.utils.utils import HttpClientConfig
+
     credentials = Credentials(api_key=api_key, url=url)  # type: ignore[call-arg]
-    client = APIClient(credentials=credentials, project_id=project_id)  # type: ignore[call-arg]
-    logger.info("watsonx_client_created", url=url)
+    http_config = HttpClientConfig(
+        timeout=httpx.Timeout(timeout),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+    )
+    client = APIClient(  # type: ignore[call-arg]
+        credentials=credentials, project_id=project_id, httpx_client=http_config
+    )
+    logger.info(
+        "watsonx_client_created",
+        url=url,
+        max_connections=max_connections,
+        timeout=timeout,
+    )
     return client
 
 
@@ -53,9 +125,9 @@ def list_available_models(client: APIClient) -> list[str]:
         model_id = model["model_id"]
 
         # Check if model is deprecated
-        lifecycle = model.get("lifecycle", [])
-        lifecycle_ids = [item.get("id", "") for item in lifecycle]
-        is_deprecated = "deprecated" in lifecycle_ids
+        is_deprecated = any(
+            item.get("id") == "deprecated" for item in model.get("lifecycle") or ()
+        )
 
         if is_deprecated:
             deprecated_count += 1
@@ -63,14 +135,14 @@ def list_available_models(client: APIClient) -> list[str]:
             continue
 
         # Check if model supports chat completions
-        tasks = model.get("tasks", [])
+        tasks = model.get("tasks") or ()
         task_ids = [task.get("id", "") for task in tasks]
-        supports_chat = "chat" in task_ids or "question_answering" in task_ids
+        supports_chat = not _CHAT_TASKS.isdisjoint(task_ids)
 
         # Also check model functions if available
-        functions = model.get("functions", [])
+        functions = model.get("functions") or ()
         function_ids = [func.get("id", "") for func in functions]
-        has_chat_function = "chat" in function_ids or "text_chat" in function_ids
+        has_chat_function = not _CHAT_FUNCTIONS.isdisjoint(function_ids)
 
         if not (supports_chat or has_chat_function):
             no_chat_count += 1
@@ -85,20 +157,11 @@ def list_available_models(client: APIClient) -> list[str]:
         # Check if model is visual/image-related
         # Visual models typically have these indicators in their ID or tasks
         model_id_lower = model_id.lower()
-        is_visual = any([
-            "vision" in model_id_lower,
-            "visual" in model_id_lower,
-            "image" in model_id_lower,
-            "vlm" in model_id_lower,  # Vision-Language Model
-            "clip" in model_id_lower,
-            "vit" in model_id_lower,  # Vision Transformer
-        ])
+        is_visual = any(token in model_id_lower for token in _VISUAL_TOKENS)
 
         # Also check the model's tasks field if available
-        has_visual_task = any([
-            "visual" in str(task).lower() or "image" in str(task).lower()
-            for task in task_ids
-        ])
+        tasks_lower = " ".join(map(str, task_ids)).lower()
+        has_visual_task = "visual" in tasks_lower or "image" in tasks_lower
 
         if is_visual or has_visual_task:
             visual_count += 1
@@ -106,11 +169,7 @@ def list_available_models(client: APIClient) -> list[str]:
             continue
 
         # Exclude guardian models, llama-3-405b, and code-instruct models
-        is_excluded = any([
-            "guardian" in model_id_lower,
-            "llama-3-405b" in model_id_lower,
-            "code-instruct" in model_id_lower,
-        ])
+        is_excluded = any(token in model_id_lower for token in _EXCLUDED_TOKENS)
 
         if is_excluded:
             excluded_count += 1
@@ -140,6 +199,7 @@ def query_model(
     prompt: str,
     max_tokens: int = 500,
     temperature: float = 0.7,
+    max_retries: int = 2,
 ) -> tuple[str, float]:
     """Query a WatsonX model using chat completion and measure response time.
 
@@ -149,64 +209,197 @@ def query_model(
         prompt: Prompt to send to the model
         max_tokens: Maximum tokens in response
         temperature: Sampling temperature
+        max_retries: Retries after a timeout or connection error
+
+    Returns:
+        Tuple of (response text, response time in seconds)
+    """
+    model = _get_inference(client, model_id, max_tokens, temperature)
+    return _chat(model, model_id, prompt, max_retries)
+
+
+def query_model_batch(
+    client: APIClient,
+    model_id: str,
+    prompts: list[str],
+    max_tokens: int = 500,
+    temperature: float = 0.7,
+    max_concurrency: int = 1,
+    max_retries: int = 2,
+) -> list[tuple[str, float] | Exception]:
+    """Query a WatsonX model with several prompts using one inference instance.
+
+    The inference instance is the model's shared one from _get_inference, so
+    no prompt pays for fetching the model specs. The chat endpoint takes a
+    single conversation per request, so each prompt is its own request; up
+    to ``max_concurrency`` of them are in flight at once over the client's
+    shared connection pool.
+
+    A prompt that fails doesn't stop the others: its error is returned in
+    its place, so one bad question only loses its own test.
+
+    Args:
+        client: WatsonX API client
+        model_id: Model ID to query
+        prompts: Prompts to send to the model
+        max_tokens: Maximum tokens in response
+        temperature: Sampling temperature
+        max_concurrency: Maximum number of prompts sent at the same time
+        max_retries: Retries per prompt after a timeout or connection error
+
+    Returns:
+        (response text, response time in seconds) tuple or the exception the
+        query raised, for each prompt in prompt order
+    """
+    logger.info(
+        "querying_model_batch",
+        model_id=model_id,
+        prompt_count=len(prompts),
+        max_concurrency=max_concurrency,
+    )
+    model = _get_inference(client, model_id, max_tokens, temperature)
+
+    def _query(prompt: str) -> tuple[str, float] | Exception:
+        try:
+            return _chat(model, model_id, prompt, max_retries)
+        except Exception as e:
+            # Already logged as model_query_failed
+            return e
+
+    workers = min(max_concurrency, len(prompts))
+    if workers <= 1:
+        return [_query(prompt) for prompt in prompts]
+
+    # map keeps prompt order
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_query, prompts))
+
+
+@functools.lru_cache(maxsize=64)
+def _get_inference(
+    client: APIClient,
+    model_id: str,
+    max_tokens: int,
+    temperature: float,
+) -> ModelInference:
+    """Return a shared model inference instance with the grading generation parameters.
+
+    Creating a ModelInference fetches the model specs from WatsonX, so one
+    instance per (client, model, parameters) is reused by every query and
+    batch in the process. The client is keyed by identity.
+
+    Args:
+        client: WatsonX API client
+        model_id: Model ID to query
+        max_tokens: Maximum tokens in response
+        temperature: Sampling temperature
+
+    Returns:
+        Configured ModelInference instance
+    """
+    from ibm_watsonx_ai.foundation_models.inference import ModelInference
+    from ibm_watsonx_ai.metanames import GenTextParamsMetaNames as GenParams
+
+    return ModelInference(
+        model_id=model_id,
+        api_client=client,
+        params={
+            GenParams.MAX_NEW_TOKENS: max_tokens,
+            GenParams.TEMPERATURE: temperature,
+            GenParams.DECODING_METHOD: "greedy",
+            GenParams.RANDOM_SEED: 42,
+        },
+    )
+
+
+def _chat(
+    model: ModelInference, model_id: str, prompt: str, max_retries: int = 2
+) -> tuple[str, float]:
+    """Send one prompt through chat completion and measure response time.
+
+    Timeouts and connection errors are retried with exponential backoff.
+    The response time covers only the attempt that succeeded, so retries
+    don't inflate a model's measured latency.
+
+    Args:
+        model: Model inference instance to use
+        model_id: Model ID being queried (for logging)
+        prompt: Prompt to send to the model
+        max_retries: Retries after a timeout or connection error
 
     Returns:
         Tuple of (response text, response time in seconds)
     """
     logger.info("querying_model", model_id=model_id, prompt_length=len(prompt))
 
-    start_time = time.time()
-
-    try:
-        # Create model inference instance
-        model = ModelInference(
-            model_id=model_id,
-            api_client=client,
-            params={
-                GenParams.MAX_NEW_TOKENS: max_tokens,
-                GenParams.TEMPERATURE: temperature,
-                GenParams.DECODING_METHOD: "greedy",
-                GenParams.RANDOM_SEED: 42,
-            },
-        )
+    # Use chat completion with messages format
+    messages = [
+        {
+            "role": "user",
+            "content": prompt,
+        }
+    ]
+
+    attempt = 0
+    while True:
+        start_time = time.perf_counter()
+
+        try:
+            # Generate response using chat
+            chat_response = model.chat(messages=messages)
+
+            # Extract text from chat response
+            # The chat response returns a dict with 'choices' containing the message
+            response_text = (
+                chat_response.get("choices", [{}])[0].get("message", {}).get("content", "")
+            )
 
-        # Use chat completion with messages format
-        messages = [
-            {
-                "role": "user",
-                "content": prompt,
-            }
-        ]
-
-        # Generate response using chat
-        chat_response = model.chat(messages=messages)
-
-        # Extract text from chat response
-        # The chat response returns a dict with 'choices' containing the message
-        response_text = (
-            chat_response.get("choices", [{}])[0].get("message", {}).get("content", "")
-        )
+            elapsed_time = time.perf_counter() - start_time
 
-        elapsed_time = time.time() - start_time
+            logger.info(
+                "model_query_success",
+                model_id=model_id,
+                response_time=round(elapsed_time, 2),
+                response_length=len(response_text),
+            )
 
-        logger.info(
-            "model_query_success",
-            model_id=model_id,
-            response_time=round(elapsed_time, 2),
-            response_length=len(response_text),
-        )
+            return response_text, elapsed_time
 
-        return response_text, elapsed_time
+        except _RETRYABLE_ERRORS as e:
+            if attempt >= max_retries:
+                _log_query_failed(model_id, e, start_time)
+                raise
+            # Exponential backoff with full jitter
+            delay = random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2**attempt))
+            logger.warning(
+                "model_query_retry",
+                model_id=model_id,
+                attempt=attempt + 1,
+                retry_in=round(delay, 2),
+                error=str(e),
+            )
+            time.sleep(delay)
+            attempt += 1
 
-    except Exception as e:
-        elapsed_time = time.time() - start_time
-        logger.error(
-            "model_query_failed",
-            model_id=model_id,
-            error=str(e),
-            elapsed_time=round(elapsed_time, 2),
-        )
-        raise
+        except Exception as e:
+            _log_query_failed(model_id, e, start_time)
+            raise
+
+
+def _log_query_failed(model_id: str, error: Exception, start_time: float) -> None:
+    """Log a model query that is not going to be retried.
+
+    Args:
+        model_id: Model ID being queried
+        error: Exception raised by the query
+        start_time: perf_counter reading when the failed attempt started
+    """
+    logger.error(
+        "model_query_failed",
+        model_id=model_id,
+        error=str(error),
+        elapsed_time=round(time.perf_counter() - start_time, 2),
+    )
 
 
 def create_prompt(question: str, context: str | None = None) -> str:
@@ -5,7 +5,18 @@ from tempfile import NamedTemporaryFile, TemporaryDirectory
 
 import pytest
 
-from modelgrader.models import GradeBreakdown, Question, TestResult
+from modelgrader.models import GradeBreakdown, Question, TestResult, _read_context
+
+
+@pytest.fixture(autouse=True)
+def clear_context_cache():
+    """Start every test with an empty context file cache.
+
+    The sample question and context directories are shared by the whole
+    session, so a read cached by one test would otherwise hide whether the
+    next test reads the file itself.
+    """
+    _read_context.cache_clear()
 
 
 @pytest.fixture
@@ -38,9 +49,12 @@ def sample_question(temp_dir):
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_grade_breakdown():
-    """Create a sample grade breakdown."""
+    """Create a sample grade breakdown, shared by the whole session.
+
+    GradeBreakdown is frozen, so no test can change it for the others.
+    """
     return GradeBreakdown(
         accuracy=85,
         completeness=75,
@@ -97,11 +111,13 @@ def mock_env_vars(monkeypatch):
     monkeypatch.setenv("GEMINI_API_KEY", "test_gemini_key")
 
 
-@pytest.fixture
-def questions_dir(temp_dir):
-    """Create a directory with sample question files."""
-    questions_path = temp_dir / "questions"
-    questions_path.mkdir()
+@pytest.fixture(scope="session")
+def questions_dir(tmp_path_factory):
+    """Create a directory with sample question files, shared by the whole session.
+
+    Tests only read from it; tests that need other files build their own.
+    """
+    questions_path = tmp_path_factory.mktemp("questions")
 
     for i in range(1, 6):
         question_file = questions_path / f"question_{i}.txt"
@@ -110,11 +126,10 @@ def questions_dir(temp_dir):
     return questions_path
 
 
-@pytest.fixture
-def contexts_dir(temp_dir):
-    """Create a directory with sample context files."""
-    contexts_path = temp_dir / "contexts"
-    contexts_path.mkdir()
+@pytest.fixture(scope="session")
+def contexts_dir(tmp_path_factory):
+    """Create a directory with sample context files, shared by the whole session."""
+    contexts_path = tmp_path_factory.mktemp("contexts")
 
     for i in range(1, 6):
         context_file = contexts_path / f"context_{i}.txt"
@@ -35,6 +35,63 @@ class TestSettings:
         assert settings.request_timeout == 120
         assert settings.question_numbers == "1"
 
+    def test_settings_concurrency_default(self, mock_env_vars):
+        """Test that concurrency defaults to a small positive value."""
+        settings = Settings()  # type: ignore[call-arg]
+
+        assert settings.concurrency == 8
+        assert settings.per_model_concurrency == 1
+        assert settings.watsonx_concurrency == 1
+
+    def test_settings_concurrency_from_env(self, mock_env_vars, monkeypatch):
+        """Test that MODELGRADER_CONCURRENCY overrides the default."""
+        monkeypatch.setenv("MODELGRADER_CONCURRENCY", "16")
+
+        settings = Settings()  # type: ignore[call-arg]
+
+        assert settings.concurrency == 16
+
+    def test_settings_per_model_concurrency_from_env(self, mock_env_vars, monkeypatch):
+        """Test that MODELGRADER_PER_MODEL_CONCURRENCY overrides the default."""
+        monkeypatch.setenv("MODELGRADER_PER_MODEL_CONCURRENCY", "2")
+
+        settings = Settings()  # type: ignore[call-arg]
+
+        assert settings.per_model_concurrency == 2
+
+    def test_settings_watsonx_concurrency_validation(self, mock_env_vars, monkeypatch):
+        """Test that MODELGRADER_WATSONX_CONCURRENCY must be positive."""
+        monkeypatch.setenv("MODELGRADER_WATSONX_CONCURRENCY", "0")
+
+        with pytest.raises(ValueError):
+            Settings()  # type: ignore[call-arg]
+
+    def test_settings_grade_cache(self, mock_env_vars, monkeypatch):
+        """Test that the grade cache is off by default and can be enabled."""
+        assert Settings().grade_cache is False  # type: ignore[call-arg]
+
+        monkeypatch.setenv("MODELGRADER_GRADE_CACHE", "true")
+
+        assert Settings().grade_cache is True  # type: ignore[call-arg]
+
+    def test_settings_gemini_quotas(self, mock_env_vars, monkeypatch):
+        """Test that Gemini quotas are unlimited by default and read from env."""
+        assert Settings().gemini_rpm is None  # type: ignore[call-arg]
+
+        monkeypatch.setenv("GEMINI_RPM", "15")
+        monkeypatch.setenv("GEMINI_TPM", "250000")
+        settings = Settings()  # type: ignore[call-arg]
+
+        assert settings.gemini_rpm == 15
+        assert settings.gemini_tpm == 250000
+
+    def test_settings_concurrency_must_be_positive(self, mock_env_vars, monkeypatch):
+        """Test that a concurrency below 1 is rejected."""
+        monkeypatch.setenv("MODELGRADER_CONCURRENCY", "0")
+
+        with pytest.raises(ValueError):
+            Settings()  # type: ignore[call-arg]
+
 
 class TestParseQuestionNumbers:
     """Tests for parse_question_numbers function."""
@@ -42,12 +99,15 @@ class TestParseQuestionNumbers:
     @pytest.mark.parametrize(
         "input_str,expected",
         [
-            ("1", [1]),
-            ("1,2,3", [1, 2, 3]),
-            ("1,2,3,4,5", [1, 2, 3, 4, 5]),
-            ("5,3,1", [5, 3, 1]),  # Order preserved
-            ("1, 2, 3", [1, 2, 3]),  # Spaces handled
-            (" 1 , 2 , 3 ", [1, 2, 3]),  # Extra spaces
+            ("1", {1}),
+            ("1,2,3", {1, 2, 3}),
+            ("1,2,3,4,5", {1, 2, 3, 4, 5}),
+            ("5,3,1", {1, 3, 5}),
+            ("1, 2, 3", {1, 2, 3}),  # Spaces handled
+            (" 1 , 2 , 3 ", {1, 2, 3}),  # Extra spaces
+            ("1-5", {1, 2, 3, 4, 5}),  # Range
+            ("1-3,8,10 - 12", {1, 2, 3, 8, 10, 11, 12}),  # Mixed ranges
+            ("2,1-3", {1, 2, 3}),  # Duplicates collapse
         ],
     )
     def test_parse_question_numbers_valid(self, input_str, expected):
@@ -56,11 +116,22 @@ class TestParseQuestionNumbers:
         assert result == expected
 
     def test_parse_question_numbers_empty(self):
-        """Test parsing empty string returns empty list."""
+        """Test parsing empty string returns empty set."""
         result = parse_question_numbers("")
-        assert result == []
+        assert result == set()
 
     def test_parse_question_numbers_with_empty_elements(self):
         """Test that empty elements are filtered out."""
         result = parse_question_numbers("1,,2,  ,3")
-        assert result == [1, 2, 3]
+        assert result == {1, 2, 3}
+
+    @pytest.mark.parametrize("input_str", ["abc", "1,x", "1-", "1-2-3"])
+    def test_parse_question_numbers_invalid(self, input_str):
+        """Test that malformed elements raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_question_numbers(input_str)
+
+    def test_parse_question_numbers_reversed_range(self):
+        """Test that a range ending before it starts raises ValueError."""
+        with pytest.raises(ValueError, match="ends before it starts"):
+            parse_question_numbers("5-1")
@@ -1,13 +1,19 @@
 """Tests for CSV writer module."""
 
 import csv
+import gc
+import os
 
 import pytest
 
 from modelgrader.csv_writer import (
     CSV_FIELDNAMES,
+    CsvAppender,
+    _read_result_rows,
     append_result_to_csv,
+    append_results_to_csv,
     initialize_csv,
+    initialize_or_resume,
     load_all_results,
     load_existing_results,
     write_results_to_csv,
@@ -41,6 +47,28 @@ class TestInitializeCSV:
         assert temp_csv_file.read_text() == "existing content"
 
 
+class TestInitializeOrResume:
+    """Tests for initialize_or_resume function."""
+
+    def test_initialize_or_resume_creates_file(self, temp_csv_file):
+        """Test that a missing file is created with headers."""
+        existing = initialize_or_resume(temp_csv_file)
+
+        assert existing == set()
+        with temp_csv_file.open("r") as f:
+            assert next(csv.reader(f)) == CSV_FIELDNAMES
+
+    def test_initialize_or_resume_loads_existing(self, temp_csv_file, multiple_test_results):
+        """Test that an existing file is left alone and its keys returned."""
+        write_results_to_csv(multiple_test_results[:2], temp_csv_file)
+        before = temp_csv_file.read_text()
+
+        existing = initialize_or_resume(temp_csv_file)
+
+        assert existing == {("model-0", 1, True), ("model-1", 1, False)}
+        assert temp_csv_file.read_text() == before
+
+
 class TestAppendResultToCSV:
     """Tests for append_result_to_csv function."""
 
@@ -70,6 +98,62 @@ class TestAppendResultToCSV:
             rows = list(reader)
             assert len(rows) == 3
 
+    def test_append_results_in_one_call(self, temp_csv_file, multiple_test_results):
+        """Test that a batch append writes the same rows as appending one by one."""
+        initialize_csv(temp_csv_file)
+        one_by_one = temp_csv_file.with_name("one_by_one.csv")
+        initialize_csv(one_by_one)
+
+        append_results_to_csv(multiple_test_results, temp_csv_file)
+        append_results_to_csv([], temp_csv_file)
+        for result in multiple_test_results:
+            append_result_to_csv(result, one_by_one)
+
+        assert temp_csv_file.read_text() == one_by_one.read_text()
+
+
+class TestCsvAppender:
+    """Tests for CsvAppender class."""
+
+    def test_appender_writes_header_to_new_file(self, temp_csv_file):
+        """Test that a new file gets headers on open."""
+        with CsvAppender(temp_csv_file):
+            pass
+
+        with temp_csv_file.open("r") as f:
+            assert next(csv.reader(f)) == CSV_FIELDNAMES
+
+    def test_appender_appends_to_existing_file(self, temp_csv_file, multiple_test_results):
+        """Test that rows are appended after existing rows without a second header."""
+        initialize_csv(temp_csv_file)
+        append_result_to_csv(multiple_test_results[0], temp_csv_file)
+
+        with CsvAppender(temp_csv_file) as appender:
+            for result in multiple_test_results[1:4]:
+                appender.append(result)
+
+        with temp_csv_file.open("r") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["Model Name"] for row in rows] == [f"model-{i}" for i in range(4)]
+
+    def test_appender_close_is_idempotent(self, temp_csv_file, sample_test_result):
+        """Test that closing twice is harmless and flushes rows."""
+        appender = CsvAppender(temp_csv_file)
+        appender.append(sample_test_result)
+        appender.close()
+        appender.close()
+
+        assert len(load_all_results(temp_csv_file)) == 1
+
+    def test_appender_flushes_every_n_rows(self, temp_csv_file, multiple_test_results):
+        """Test that rows reach the file once flush_every appends accumulate."""
+        with CsvAppender(temp_csv_file, flush_every=2) as appender:
+            appender.append(multiple_test_results[0])
+            assert len(load_existing_results(temp_csv_file)) == 0
+
+            appender.append(multiple_test_results[1])
+            assert len(load_existing_results(temp_csv_file)) == 2
+
 
 class TestLoadExistingResults:
     """Tests for load_existing_results function."""
@@ -113,6 +197,25 @@ class TestLoadExistingResults:
         # Should only have one unique combination
         assert len(existing) == 1
 
+    def test_load_existing_results_skips_blank_lines(
+        self, temp_csv_file, sample_test_result
+    ):
+        """Test that blank lines in the CSV are ignored."""
+        initialize_csv(temp_csv_file)
+        append_result_to_csv(sample_test_result, temp_csv_file)
+        with temp_csv_file.open("a") as f:
+            f.write("\n")
+
+        existing = load_existing_results(temp_csv_file)
+
+        assert existing == {("ibm/granite-3.1-8b-instruct", 1, True)}
+
+    def test_load_existing_results_header_only(self, temp_csv_file):
+        """Test loading a CSV that only has headers."""
+        initialize_csv(temp_csv_file)
+
+        assert load_existing_results(temp_csv_file) == set()
+
 
 class TestLoadAllResults:
     """Tests for load_all_results function."""
@@ -156,6 +259,93 @@ class TestLoadAllResults:
         assert result.grades.completeness == 75
         assert result.grades.clarity == 80
 
+    def test_load_all_results_preserves_explanation(self, temp_csv_file, sample_test_result):
+        """Test that the grading explanation survives a round trip."""
+        grades = sample_test_result.grades.model_copy(
+            update={"explanation": 'Accurate, but "verbose".'}
+        )
+        result = sample_test_result.model_copy(update={"grades": grades})
+        write_results_to_csv([result], temp_csv_file)
+
+        loaded_results = load_all_results(temp_csv_file)
+
+        assert loaded_results[0].grades.explanation == 'Accurate, but "verbose".'
+        assert loaded_results[0].percentile == 75.5
+
+    def test_load_all_results_restores_gc(self, temp_csv_file, multiple_test_results):
+        """Test that the garbage collector is re-enabled after parsing."""
+        write_results_to_csv(multiple_test_results[:3], temp_csv_file)
+
+        load_all_results(temp_csv_file)
+
+        assert gc.isenabled()
+
+
+class TestLoadCaching:
+    """Tests for memoization of the CSV loaders."""
+
+    def test_repeated_loads_reuse_parsed_rows(self, temp_csv_file, multiple_test_results):
+        """Test that an unchanged file is only parsed once."""
+        write_results_to_csv(multiple_test_results[:3], temp_csv_file)
+        _read_result_rows.cache_clear()
+
+        load_all_results(temp_csv_file)
+        load_all_results(temp_csv_file)
+
+        info = _read_result_rows.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_append_invalidates_cache(self, temp_csv_file, multiple_test_results):
+        """Test that appending a result is picked up by the next load."""
+        write_results_to_csv(multiple_test_results[:3], temp_csv_file)
+        assert len(load_existing_results(temp_csv_file)) == 3
+        assert len(load_all_results(temp_csv_file)) == 3
+
+        append_result_to_csv(multiple_test_results[3], temp_csv_file)
+
+        assert len(load_existing_results(temp_csv_file)) == 4
+        assert len(load_all_results(temp_csv_file)) == 4
+
+    def test_rewrite_with_same_stat_invalidates_cache(
+        self, temp_csv_file, sample_test_result
+    ):
+        """Test that a rewrite keeping the file's size and mtime isn't served stale."""
+        write_results_to_csv([sample_test_result], temp_csv_file)
+        stat = os.stat(temp_csv_file)
+        assert load_all_results(temp_csv_file)[0].percentile == 75.5
+
+        write_results_to_csv(
+            [sample_test_result.model_copy(update={"percentile": 12.5})], temp_csv_file
+        )
+        os.utime(temp_csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert os.stat(temp_csv_file).st_size == stat.st_size
+
+        assert load_all_results(temp_csv_file)[0].percentile == 12.5
+
+    def test_appender_invalidates_cache(self, temp_csv_file, multiple_test_results):
+        """Test that rows written through CsvAppender clear the cached reads."""
+        write_results_to_csv(multiple_test_results[:3], temp_csv_file)
+        load_all_results(temp_csv_file)
+        load_existing_results(temp_csv_file)
+
+        with CsvAppender(temp_csv_file) as appender:
+            appender.append(multiple_test_results[3])
+
+        assert _read_result_rows.cache_info().currsize == 0
+        assert len(load_existing_results(temp_csv_file)) == 4
+
+    def test_cached_results_are_not_shared(self, temp_csv_file, sample_test_result):
+        """Test that modifying loaded results doesn't affect later loads."""
+        write_results_to_csv([sample_test_result], temp_csv_file)
+
+        first = load_all_results(temp_csv_file)
+        first[0].percentile = 1.0
+        existing = load_existing_results(temp_csv_file)
+        existing.clear()
+
+        assert load_all_results(temp_csv_file)[0].percentile == 75.5
+        assert len(load_existing_results(temp_csv_file)) == 1
+
 
 class TestWriteResultsToCSV:
     """Tests for write_results_to_csv function."""
@@ -1,15 +1,75 @@
 """Tests for gemini grader module."""
 
+import json
+
 import pytest
+from google.api_core.exceptions import ResourceExhausted
 
+from modelgrader import gemini_grader
 from modelgrader.gemini_grader import (
+    _BATCH_SYSTEM_INSTRUCTION,
+    _SINGLE_SYSTEM_INSTRUCTION,
+    _create_batch_grading_prompt,
     _create_grading_prompt,
-    _extract_explanation,
-    _parse_grades,
+    _generate_with_retry,
+    _grades_from_payload,
+    grade_responses_batch,
 )
+from modelgrader.grade_cache import GradeCache
 from modelgrader.models import GradeBreakdown
 
 
+class FakeResult:
+    """Stand-in for a Gemini response."""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Stand-in for GenerativeModel that answers from a reply function."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    def generate_content(self, prompt, request_options=None):
+        self.prompts.append(prompt)
+        self.request_options = request_options
+        return FakeResult(self.reply(prompt))
+
+
+def _batch_items(prompt):
+    """Pull the ITEMS array back out of a batch grading prompt."""
+    return json.loads(prompt.split("ITEMS:\n", 1)[1])
+
+
+def _batch_reply(prompt):
+    """Grade each batch item with accuracy 10 * id, in reverse order."""
+    return json.dumps(
+        [
+            {"id": item["id"], "accuracy": 10 * item["id"], "completeness": 50, "clarity": 50}
+            for item in reversed(_batch_items(prompt))
+        ]
+    )
+
+
+def _single_reply(prompt):
+    """Grade a single response with fixed scores."""
+    return json.dumps({"accuracy": 99, "completeness": 1, "clarity": 1, "explanation": "single"})
+
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    """Replace Gemini models with fakes and disable the grade cache."""
+    models = {"single": FakeModel(_single_reply), "batch": FakeModel(_batch_reply)}
+    monkeypatch.setattr(
+        gemini_grader, "_get_model", lambda model_name, schema_key: models[schema_key]
+    )
+    monkeypatch.setattr(gemini_grader, "_grade_cache", None)
+    return models
+
+
 class TestCreateGradingPrompt:
     """Tests for _create_grading_prompt function."""
 
@@ -22,98 +82,70 @@ class TestCreateGradingPrompt:
 
         assert question in prompt
         assert response in prompt
-        assert "ACCURACY" in prompt
-        assert "COMPLETENESS" in prompt
-        assert "CLARITY" in prompt
-        assert "RESPONSE_TIME" not in prompt
         assert "CONTEXT PROVIDED TO MODEL:" not in prompt
+        # The rubric travels in the system instruction, not in every prompt
+        assert "STRICT Grading scale" not in prompt
 
+    @pytest.mark.parametrize(
+        "system_instruction", [_SINGLE_SYSTEM_INSTRUCTION, _BATCH_SYSTEM_INSTRUCTION]
+    )
+    def test_system_instructions_hold_rubric(self, system_instruction):
+        """Test that both system instructions carry the full rubric."""
+        assert "ACCURACY" in system_instruction
+        assert "COMPLETENESS" in system_instruction
+        assert "CLARITY" in system_instruction
+        assert "RESPONSE_TIME" not in system_instruction
+        assert system_instruction.count("STRICT Grading scale") == 1
+
+    def test_create_batch_grading_prompt(self):
+        """Test that a batch prompt lists every item once with its id."""
+        items = [("Question A?", 'Answer "A"'), ("Question B?", "Answer B")]
+
+        prompt = _create_batch_grading_prompt(items)
+
+        assert _batch_items(prompt) == [
+            {"id": 0, "question": "Question A?", "response": 'Answer "A"'},
+            {"id": 1, "question": "Question B?", "response": "Answer B"},
+        ]
+        assert "STRICT Grading scale" not in prompt
+        assert "JSON array" in _BATCH_SYSTEM_INSTRUCTION
+
+
+class TestGradesFromPayload:
+    """Tests for _grades_from_payload function."""
+
+    def test_grades_from_payload_valid(self):
+        """Test converting a complete grading reply."""
+        grades = _grades_from_payload(
+            {"accuracy": 85, "completeness": 75, "clarity": 80, "explanation": "Clear."},
+            "",
+        )
+
+        assert grades == GradeBreakdown(
+            accuracy=85, completeness=75, clarity=80, explanation="Clear."
+        )
+
+    def test_grades_from_payload_clamps_to_max(self):
+        """Test that grades over 100 are clamped to 100."""
+        grades = _grades_from_payload({"accuracy": 150, "completeness": 110, "clarity": 105}, "")
 
-class TestParseGrades:
-    """Tests for _parse_grades function."""
-
-    def test_parse_grades_valid_output(self):
-        """Test parsing valid Gemini output."""
-        grade_text = """
-ACCURACY: 85
-COMPLETENESS: 75
-CLARITY: 80
-
-Justification: The response was accurate and clear...
-"""
-        grades = _parse_grades(grade_text)
-
-        assert grades.accuracy == 85
-        assert grades.completeness == 75
-        assert grades.clarity == 80
-
-    def test_parse_grades_lowercase(self):
-        """Test parsing grades with lowercase keys."""
-        grade_text = """
-accuracy: 70
-completeness: 65
-clarity: 75
-"""
-        grades = _parse_grades(grade_text)
-
-        assert grades.accuracy == 70
-        assert grades.completeness == 65
-        assert grades.clarity == 75
+        assert (grades.accuracy, grades.completeness, grades.clarity) == (100, 100, 100)
 
-    def test_parse_grades_with_extra_text(self):
-        """Test parsing grades with surrounding text."""
-        grade_text = """
-Here are my grades for this response:
+    def test_grades_from_payload_clamps_to_min(self):
+        """Test that negative grades are clamped to 0."""
+        grades = _grades_from_payload({"accuracy": -5, "completeness": -10, "clarity": -2}, "")
 
-ACCURACY: 90
-COMPLETENESS: 85
-CLARITY: 88
+        assert (grades.accuracy, grades.completeness, grades.clarity) == (0, 0, 0)
 
-The response was excellent because...
-"""
-        grades = _parse_grades(grade_text)
+    def test_grades_from_payload_missing_fields_default(self):
+        """Test that missing scores default to 50 without touching the reply."""
+        grading_data = {"accuracy": 85}
 
-        assert grades.accuracy == 90
-        assert grades.completeness == 85
+        grades = _grades_from_payload(grading_data, '{"accuracy": 85}')
 
-    def test_parse_grades_clamps_to_max(self):
-        """Test that grades over 100 are clamped to 100."""
-        grade_text = """
-ACCURACY: 150
-COMPLETENESS: 110
-CLARITY: 105
-"""
-        grades = _parse_grades(grade_text)
-
-        # All should be clamped to 100
-        assert grades.accuracy == 100
-        assert grades.completeness == 100
-        assert grades.clarity == 100
-
-    def test_parse_grades_clamps_to_min(self):
-        """Test that negative grades are clamped to 0."""
-        grade_text = """
-ACCURACY: -5
-COMPLETENESS: -10
-CLARITY: -2
-"""
-        grades = _parse_grades(grade_text)
-
-        # All should be clamped to 0
-        assert grades.accuracy == 0
-        assert grades.completeness == 0
-        assert grades.clarity == 0
-
-    def test_parse_grades_missing_field_raises_error(self):
-        """Test that missing required field raises ValueError."""
-        grade_text = """
-ACCURACY: 85
-COMPLETENESS: 75
-"""
-        # Missing CLARITY
-
-        with pytest.raises(ValueError, match="Could not parse grades"):
-            _parse_grades(grade_text)
+        assert (grades.accuracy, grades.completeness, grades.clarity) == (85, 50, 50)
+        assert grades.explanation == "No explanation provided."
+        assert grading_data == {"accuracy": 85}
 
     @pytest.mark.parametrize(
         "accuracy,completeness,clarity",
@@ -121,85 +153,148 @@ COMPLETENESS: 75
             (100, 100, 100),
             (0, 0, 0),
             (85, 75, 80),
-            (50, 60, 55),
+            ("50", "60", "55"),
         ],
     )
-    def test_parse_grades_various_values(
-        self, accuracy, completeness, clarity
+    def test_grades_from_payload_various_values(self, accuracy, completeness, clarity):
+        """Test converting various grade combinations."""
+        grades = _grades_from_payload(
+            {"accuracy": accuracy, "completeness": completeness, "clarity": clarity}, ""
+        )
+
+        assert grades.accuracy == int(accuracy)
+        assert grades.completeness == int(completeness)
+        assert grades.clarity == int(clarity)
+
+
+class TestGradeResponsesBatch:
+    """Tests for grade_responses_batch function."""
+
+    def test_grade_responses_batch_maps_by_id(self, fake_models):
+        """Test that one request grades every item and replies map back by id."""
+        items = [(f"Question {i}?", f"Answer {i}") for i in range(3)]
+
+        grades = grade_responses_batch(items)
+
+        assert [g.accuracy for g in grades] == [0, 10, 20]
+        assert len(fake_models["batch"].prompts) == 1
+        assert fake_models["single"].prompts == []
+
+    def test_grade_responses_batch_falls_back_on_bad_reply(self, fake_models):
+        """Test that items are graded one by one when ids don't match."""
+        fake_models["batch"].reply = lambda prompt: json.dumps([{"id": 7, "accuracy": 1}])
+
+        grades = grade_responses_batch([("Q1?", "A1"), ("Q2?", "A2")])
+
+        assert [g.accuracy for g in grades] == [99, 99]
+        assert len(fake_models["single"].prompts) == 2
+
+    def test_grade_responses_batch_falls_back_on_truncated_json(self, fake_models):
+        """Test that a reply that isn't valid JSON is graded one by one."""
+        fake_models["batch"].reply = lambda prompt: '[{"id": 0, "accuracy": 8'
+
+        grades = grade_responses_batch([("Q1?", "A1"), ("Q2?", "A2")])
+
+        assert [g.accuracy for g in grades] == [99, 99]
+
+    def test_grade_responses_batch_single_item(self, fake_models):
+        """Test that a lone item uses the single-response prompt."""
+        grades = grade_responses_batch([("Q1?", "A1")])
+
+        assert grades[0].explanation == "single"
+        assert fake_models["batch"].prompts == []
+
+    def test_grade_responses_batch_uses_cache(self, fake_models, monkeypatch, temp_dir):
+        """Test that cached items are skipped and new grades are cached."""
+        cache = GradeCache(temp_dir / "grades.sqlite")
+        monkeypatch.setattr(gemini_grader, "_grade_cache", cache)
+        items = [("Q1?", "A1"), ("Q2?", "A2")]
+        grade_responses_batch(items)
+
+        grades = grade_responses_batch(items + [("Q3?", "A3")])
+        cache.close()
+
+        assert [g.accuracy for g in grades] == [0, 10, 99]
+        assert len(fake_models["batch"].prompts) == 1
+        assert len(fake_models["single"].prompts) == 1
+
+    def test_batch_and_single_grades_cached_separately(
+        self, fake_models, monkeypatch, temp_dir
     ):
-        """Test parsing various grade combinations."""
-        grade_text = f"""
-ACCURACY: {accuracy}
-COMPLETENESS: {completeness}
-CLARITY: {clarity}
-"""
-        grades = _parse_grades(grade_text)
-
-        assert grades.accuracy == accuracy
-        assert grades.completeness == completeness
-        assert grades.clarity == clarity
-
-    def test_parse_grades_includes_explanation(self):
-        """Test that explanation is extracted from grade text."""
-        grade_text = """
-ACCURACY: 85
-COMPLETENESS: 75
-CLARITY: 80
-
-The response was accurate but lacked some detail. It could have included more examples.
-"""
-        grades = _parse_grades(grade_text)
-
-        assert grades.explanation
-        assert "accurate" in grades.explanation.lower()
-        assert len(grades.explanation) <= 200
-
-
-class TestExtractExplanation:
-    """Tests for _extract_explanation function."""
-
-    def test_extract_explanation_from_justification(self):
-        """Test extracting explanation from justification text."""
-        grade_text = """
-ACCURACY: 85
-COMPLETENESS: 75
-CLARITY: 80
-
-The response was accurate but lacked some detail. It could have included more examples to improve completeness.
-"""
-        explanation = _extract_explanation(grade_text)
-
-        assert "accurate" in explanation.lower()
-        assert len(explanation) <= 200
-
-    def test_extract_explanation_truncates_long_text(self):
-        """Test that long explanations are truncated."""
-        # Create a single very long sentence (no sentence breaks)
-        long_text = "A" * 300
-        grade_text = f"""
-ACCURACY: 85
-COMPLETENESS: 75
-CLARITY: 80
-
-{long_text}
-"""
-        explanation = _extract_explanation(grade_text)
-
-        assert len(explanation) <= 200
-        assert explanation.endswith("...")
-
-    def test_extract_explanation_handles_missing_justification(self):
-        """Test handling when no justification is present."""
-        grade_text = """
-ACCURACY: 85
-COMPLETENESS: 75
-CLARITY: 80
-"""
-        explanation = _extract_explanation(grade_text)
-
-        assert explanation == "No explanation provided."
+        """Test that a batch grade is never served to a single-grade call."""
+        cache = GradeCache(temp_dir / "grades.sqlite")
+        monkeypatch.setattr(gemini_grader, "_grade_cache", cache)
+        grade_responses_batch([("Q1?", "A1"), ("Q2?", "A2")])
+
+        first = grade_responses_batch([("Q1?", "A1")])
+        second = grade_responses_batch([("Q1?", "A1")])
+        cache.close()
+
+        assert first[0].explanation == second[0].explanation == "single"
+        assert len(fake_models["single"].prompts) == 1
+
+
+class TestGenerateWithRetry:
+    """Tests for _generate_with_retry function."""
+
+    @pytest.fixture(autouse=True)
+    def no_sleep(self, monkeypatch):
+        """Skip backoff delays."""
+        monkeypatch.setattr(gemini_grader.time, "sleep", lambda seconds: None)
+
+    @pytest.fixture
+    def model(self, fake_models):
+        """Return the fake model used for single grading requests."""
+        return fake_models["single"]
+
+    def test_retries_quota_errors(self, model):
+        """Test that a quota error is retried until the call succeeds."""
+        failures = iter([ResourceExhausted("quota"), ResourceExhausted("quota")])
+
+        def reply(prompt):
+            if (error := next(failures, None)) is not None:
+                raise error
+            return "ok"
+
+        model.reply = reply
+
+        assert _generate_with_retry("gemini", "single", "prompt").text == "ok"
+        assert len(model.prompts) == 3
+
+    def test_gives_up_after_max_attempts(self, model):
+        """Test that the quota error is raised once retries run out."""
+
+        def reply(prompt):
+            raise ResourceExhausted("quota")
+
+        model.reply = reply
+
+        with pytest.raises(ResourceExhausted):
+            _generate_with_retry("gemini", "single", "prompt")
+        assert len(model.prompts) == gemini_grader._MAX_ATTEMPTS
+
+    def test_passes_request_timeout(self, model, monkeypatch):
+        """Test that the configured timeout is sent with each request."""
+        model.reply = lambda prompt: "ok"
+        monkeypatch.setattr(gemini_grader, "_request_timeout", 30)
+
+        _generate_with_retry("gemini", "single", "prompt")
+
+        assert model.request_options == {"timeout": 30}
+
+    def test_other_errors_not_retried(self, model):
+        """Test that non-quota errors propagate immediately."""
+
+        def reply(prompt):
+            raise RuntimeError("bad request")
+
+        model.reply = reply
+
+        with pytest.raises(RuntimeError):
+            _generate_with_retry("gemini", "single", "prompt")
+        assert len(model.prompts) == 1
 
 
 # Note: grade_response and configure_gemini require actual API calls to Google Gemini,
 # so they would need mocking or integration tests. For unit tests, we test the
-# helper functions that don't require API calls.
+# helper functions with fake models.
@@ -0,0 +1,51 @@
+"""Tests for grade cache module."""
+
+import pytest
+
+from modelgrader.grade_cache import GradeCache
+
+
+@pytest.fixture
+def grade_cache(temp_dir):
+    """Create a grade cache in a temporary directory."""
+    cache = GradeCache(temp_dir / "cache" / "grades.sqlite")
+    yield cache
+    cache.close()
+
+
+class TestGradeCache:
+    """Tests for GradeCache class."""
+
+    def test_miss_then_hit(self, grade_cache, sample_grade_breakdown):
+        """Test that stored grades are returned and hits/misses counted."""
+        key = GradeCache.make_key("gemini", "prompt")
+
+        assert grade_cache.get(key) is None
+        grade_cache.set(key, sample_grade_breakdown)
+
+        assert grade_cache.get(key) == sample_grade_breakdown
+        assert (grade_cache.hits, grade_cache.misses) == (1, 1)
+
+    def test_persists_across_instances(self, temp_dir, sample_grade_breakdown):
+        """Test that grades survive closing and reopening the database."""
+        path = temp_dir / "grades.sqlite"
+        key = GradeCache.make_key("gemini", "prompt")
+
+        cache = GradeCache(path)
+        cache.set(key, sample_grade_breakdown)
+        cache.close()
+
+        cache = GradeCache(path)
+        assert cache.get(key) == sample_grade_breakdown
+        cache.close()
+
+    @pytest.mark.parametrize(
+        "other",
+        [
+            ("gemini-other", "prompt"),
+            ("gemini", "prompt "),
+        ],
+    )
+    def test_key_depends_on_model_and_prompt(self, other):
+        """Test that a different model or prompt gives a different key."""
+        assert GradeCache.make_key("gemini", "prompt") != GradeCache.make_key(*other)
@@ -0,0 +1,217 @@
+"""Tests for the main orchestration in modelgrader/__init__.py."""
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+import modelgrader
+from modelgrader import test_runner
+from modelgrader.config import Settings
+from modelgrader.csv_writer import load_all_results
+from modelgrader.models import GradeBreakdown
+
+MODEL_IDS = ["model-a", "model-b", "model-c"]
+
+
+async def _let_others_run():
+    """Yield to the event loop so every ready task gets to start."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def settings(temp_dir, questions_dir, contexts_dir):
+    """Settings for a five-question run against stubbed clients."""
+    return Settings(
+        _env_file=None,  # type: ignore[call-arg]
+        watsonx_api_key="test_watsonx_key",
+        watsonx_project_id="test_project_id",
+        gemini_api_key="test_gemini_key",
+        output_csv_path=str(temp_dir / "results.csv"),
+        questions_dir=str(questions_dir),
+        contexts_dir=str(contexts_dir),
+        question_numbers="1-5",
+        modelgrader_grade_cache=False,
+        modelgrader_concurrency=2,
+        modelgrader_per_model_concurrency=1,
+    )
+
+
+@pytest.fixture
+def stub_clients(monkeypatch, settings):
+    """Replace configuration and both API clients with stand-ins."""
+    monkeypatch.setattr(modelgrader, "load_settings", lambda: settings)
+    monkeypatch.setattr(modelgrader, "configure_gemini", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        modelgrader, "create_watsonx_client", lambda *args, **kwargs: object()
+    )
+    monkeypatch.setattr(modelgrader, "list_available_models", lambda client: MODEL_IDS)
+    monkeypatch.setattr(
+        test_runner,
+        "grade_responses_batch",
+        lambda items: (
+            [GradeBreakdown(accuracy=80, completeness=70, clarity=60)] * len(items)
+        ),
+    )
+
+
+async def _echo_query(client, model_id, prompts, max_concurrency=1):
+    """Answer every prompt without calling WatsonX."""
+    return [(f"{model_id} answer", 1.0) for _ in prompts]
+
+
+class TestAmain:
+    """Tests for the _amain orchestration."""
+
+    @pytest.mark.asyncio
+    async def test_respects_concurrency_limits(
+        self, monkeypatch, stub_clients, settings
+    ):
+        """Test that global and per-model limits hold while every test runs."""
+        running = Counter()
+        peaks = Counter()
+
+        def _enter(key):
+            running[key] += 1
+            peaks[key] = max(peaks[key], running[key])
+
+        async def fake_query(client, model_id, prompts, max_concurrency=1):
+            _enter("global")
+            _enter(model_id)
+            await _let_others_run()
+            running["global"] -= 1
+            running[model_id] -= 1
+            return await _echo_query(client, model_id, prompts)
+
+        async def fake_grade(model_id, questions, with_context, responses):
+            _enter("global")
+            await _let_others_run()
+            running["global"] -= 1
+            return test_runner.grade_batch_responses(
+                model_id, questions, with_context, responses
+            )
+
+        monkeypatch.setattr(modelgrader, "query_batch_async", fake_query)
+        monkeypatch.setattr(modelgrader, "grade_batch_responses_async", fake_grade)
+
+        await modelgrader._amain()
+
+        assert peaks["global"] == settings.concurrency
+        assert all(
+            peaks[model_id] == settings.per_model_concurrency for model_id in MODEL_IDS
+        )
+        results = load_all_results(settings.output_csv_path)
+        assert len(results) == len(MODEL_IDS) * 5 * 2
+
+    @pytest.mark.asyncio
+    async def test_failures_only_lose_their_own_tests(
+        self, monkeypatch, stub_clients, settings
+    ):
+        """Test that a failed question or batch doesn't sink the other tests."""
+
+        async def fake_query(client, model_id, prompts, max_concurrency=1):
+            if model_id == "model-b":
+                raise RuntimeError("model unavailable")
+            responses = await _echo_query(client, model_id, prompts)
+            # The second question fails for model-a, with and without context
+            if model_id == "model-a":
+                responses[1] = RuntimeError("bad request")
+            return responses
+
+        monkeypatch.setattr(modelgrader, "query_batch_async", fake_query)
+
+        await modelgrader._amain()
+
+        results = load_all_results(settings.output_csv_path)
+        tested = Counter(r.model_name for r in results)
+        assert tested == {"model-a": 8, "model-c": 10}
+        model_a_questions = {
+            r.question_number for r in results if r.model_name == "model-a"
+        }
+        assert model_a_questions == {1, 3, 4, 5}
+
+    @pytest.mark.asyncio
+    async def test_resume_with_nothing_pending_skips_rewrite(
+        self, monkeypatch, stub_clients, settings
+    ):
+        """Test that the CSV isn't rewritten when its percentiles are current."""
+        monkeypatch.setattr(modelgrader, "query_batch_async", _echo_query)
+        await modelgrader._amain()
+
+        def fail_query(*args, **kwargs):
+            pytest.fail("nothing should be queried on resume")
+
+        writes = []
+        monkeypatch.setattr(modelgrader, "query_batch_async", fail_query)
+        monkeypatch.setattr(
+            modelgrader,
+            "write_results_to_csv",
+            lambda results, path: writes.append(results),
+        )
+
+        await modelgrader._amain()
+
+        assert writes == []
+
+    @pytest.mark.asyncio
+    async def test_preload_contexts_is_opt_in(
+        self, monkeypatch, stub_clients, settings
+    ):
+        """Test that contexts are only preloaded when enabled."""
+        preloaded = []
+        monkeypatch.setattr(modelgrader, "query_batch_async", _echo_query)
+        monkeypatch.setattr(
+            modelgrader,
+            "preload_contexts",
+            lambda questions: preloaded.append([q.number for q in questions]),
+        )
+
+        await modelgrader._amain()
+
+        assert preloaded == []
+
+    @pytest.mark.asyncio
+    async def test_preload_contexts_only_selected_questions(
+        self, monkeypatch, stub_clients, settings
+    ):
+        """Test that only the selected questions have their contexts preloaded."""
+        settings.question_numbers = "2,4"
+        settings.preload_contexts = True
+        preloaded = []
+        monkeypatch.setattr(modelgrader, "query_batch_async", _echo_query)
+        monkeypatch.setattr(
+            modelgrader,
+            "preload_contexts",
+            lambda questions: preloaded.append([q.number for q in questions]),
+        )
+
+        await modelgrader._amain()
+
+        assert preloaded == [[2, 4]]
+
+    @pytest.mark.asyncio
+    async def test_grade_cache_closed_when_run_fails(
+        self, monkeypatch, stub_clients, settings
+    ):
+        """Test that the grade cache is closed even if the run raises."""
+        closed = []
+
+        class FakeGradeCache:
+            def __init__(self, path):
+                pass
+
+            def close(self):
+                closed.append(True)
+
+        def fail_configure(*args, **kwargs):
+            raise RuntimeError("bad Gemini configuration")
+
+        settings.grade_cache = True
+        monkeypatch.setattr(modelgrader, "GradeCache", FakeGradeCache)
+        monkeypatch.setattr(modelgrader, "configure_gemini", fail_configure)
+
+        with pytest.raises(RuntimeError, match="bad Gemini configuration"):
+            await modelgrader._amain()
+
+        assert closed == [True]
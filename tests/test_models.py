@@ -1,7 +1,10 @@
 """Tests for data models."""
 
+from pathlib import Path
+
 import pytest
 
+from modelgrader.csv_writer import CSV_FIELDNAMES
 from modelgrader.models import GradeBreakdown, Question, TestResult, calculate_percentiles
 
 
@@ -29,6 +32,30 @@ class TestQuestion:
         context = question.load_context()
         assert context == ""
 
+    def test_load_context_reads_file_once(self, sample_question, monkeypatch):
+        """Test that an unchanged context file is only read once."""
+        reads = []
+        read_text = Path.read_text
+
+        def counting_read_text(self, *args, **kwargs):
+            reads.append(self)
+            return read_text(self, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "read_text", counting_read_text)
+
+        first = sample_question.load_context()
+        second = sample_question.load_context()
+
+        assert first == second
+        assert len(reads) == 1
+
+    def test_load_context_sees_edits(self, sample_question):
+        """Test that editing the context file invalidates the cached text."""
+        sample_question.load_context()
+        sample_question.context_path.write_text("Updated context, longer than before.")
+
+        assert sample_question.load_context() == "Updated context, longer than before."
+
     def test_load_context_no_path(self):
         """Test loading context when path is None."""
         question = Question(
@@ -82,6 +109,19 @@ class TestGradeBreakdown:
                 clarity=50,
             )
 
+    def test_grades_are_frozen(self, sample_grade_breakdown):
+        """Test that scores can't be reassigned in place."""
+        with pytest.raises(ValueError):
+            sample_grade_breakdown.accuracy = 0
+
+    def test_weighted_score_follows_model_copy(self, sample_grade_breakdown):
+        """Test that a copy with new scores reports its own weighted score."""
+        assert sample_grade_breakdown.weighted_score == 81.25
+
+        copy = sample_grade_breakdown.model_copy(update={"accuracy": 0})
+
+        assert copy.weighted_score == 38.75
+
 
 class TestTestResult:
     """Tests for TestResult model."""
@@ -111,6 +151,13 @@ class TestTestResult:
         assert "Weighted Score" in row
         assert "Percentile Rank" in row
 
+    def test_to_csv_tuple_matches_csv_row(self, sample_test_result):
+        """Test that the tuple form has the same values in CSV column order."""
+        row = sample_test_result.to_csv_row()
+
+        assert list(row) == CSV_FIELDNAMES
+        assert sample_test_result.to_csv_tuple() == tuple(row.values())
+
     def test_to_csv_row_no_context(self, sample_grade_breakdown):
         """Test CSV row with no context."""
         result = TestResult(
@@ -0,0 +1,84 @@
+"""Tests for rate limiting module."""
+
+import pytest
+
+from modelgrader import ratelimit
+from modelgrader.ratelimit import TokenBucket, per_minute_bucket
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Replace the clock and sleep so time only advances when sleeping."""
+    clock = {"now": 0.0, "sleeps": []}
+
+    def fake_sleep(seconds):
+        clock["sleeps"].append(seconds)
+        clock["now"] += seconds
+
+    monkeypatch.setattr(ratelimit, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(ratelimit, "sleep", fake_sleep)
+    return clock
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket class."""
+
+    def test_burst_does_not_wait(self, fake_clock):
+        """Test that a full bucket serves a burst without waiting."""
+        bucket = TokenBucket(rate_per_sec=1, burst=3)
+
+        waits = [bucket.acquire() for _ in range(3)]
+
+        assert waits == [0.0, 0.0, 0.0]
+        assert fake_clock["sleeps"] == []
+
+    def test_waits_for_refill_when_empty(self, fake_clock):
+        """Test that callers are paced to the refill rate once the burst is spent."""
+        bucket = TokenBucket(rate_per_sec=2, burst=1)
+
+        bucket.acquire()
+        bucket.acquire()
+        bucket.acquire()
+
+        assert fake_clock["sleeps"] == [0.5, 0.5]
+
+    def test_refills_over_time(self, fake_clock):
+        """Test that idle time refills the bucket up to its size."""
+        bucket = TokenBucket(rate_per_sec=1, burst=2)
+        bucket.acquire(2)
+
+        fake_clock["now"] += 10
+
+        assert bucket.acquire(2) == 0.0
+
+    def test_cost_capped_at_burst(self, fake_clock):
+        """Test that a request larger than the bucket waits for a full bucket only."""
+        bucket = TokenBucket(rate_per_sec=1, burst=2)
+        bucket.acquire(2)
+
+        assert bucket.acquire(100) == 2.0
+
+    @pytest.mark.parametrize("rate,burst", [(0, 1), (1, 0), (-1, 1)])
+    def test_rejects_non_positive_settings(self, rate, burst):
+        """Test that rate and burst must be positive."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate_per_sec=rate, burst=burst)
+
+
+class TestPerMinuteBucket:
+    """Tests for per_minute_bucket function."""
+
+    @pytest.mark.parametrize(
+        "limit,rate,burst",
+        [
+            (60, 1.0, 6),
+            (15, 0.25, 1),
+            (5, 5 / 60, 1),
+        ],
+    )
+    def test_per_minute_bucket(self, limit, rate, burst):
+        """Test converting a per-minute quota into a bucket."""
+        bucket = per_minute_bucket(limit)
+
+        assert bucket.rate_per_sec == rate
+        assert bucket.burst == burst
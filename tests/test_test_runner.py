@@ -1,8 +1,21 @@
 """Tests for test runner module."""
 
+import threading
+from pathlib import Path
+
 import pytest
+from google.api_core.exceptions import ResourceExhausted
 
-from modelgrader.test_runner import load_questions
+from modelgrader import test_runner
+from modelgrader.models import GradeBreakdown
+from modelgrader.test_runner import (
+    build_prompt,
+    grade_batch_responses,
+    load_questions,
+    preload_contexts,
+    run_all_tests,
+    run_single_test_async,
+)
 
 
 class TestLoadQuestions:
@@ -72,6 +85,25 @@ class TestLoadQuestions:
         # Should be sorted by number
         assert [q.number for q in questions] == [1, 2, 3, 4, 5]
 
+    def test_load_questions_numeric_order_and_filtering(self, temp_dir):
+        """Test that multi-digit numbers sort numerically and other files are ignored."""
+        questions_path = temp_dir / "questions"
+        contexts_path = temp_dir / "contexts"
+        questions_path.mkdir()
+        contexts_path.mkdir()
+
+        for num in [10, 2, 1]:
+            (questions_path / f"question_{num}.txt").write_text(f"Question {num}")
+        (questions_path / "notes.txt").write_text("not a question")
+        (questions_path / "question_3.md").write_text("wrong extension")
+        (questions_path / "question_draft.txt").write_text("not numbered")
+        (contexts_path / "context_2.txt").write_text("Context 2")
+
+        questions = load_questions(questions_path, contexts_path)
+
+        assert [q.number for q in questions] == [1, 2, 10]
+        assert [q.context_path is not None for q in questions] == [False, True, False]
+
     @pytest.mark.parametrize("num_questions", [1, 3, 10])
     def test_load_questions_various_counts(self, temp_dir, num_questions):
         """Test loading various numbers of questions."""
@@ -89,6 +121,259 @@ class TestLoadQuestions:
         assert len(questions) == num_questions
 
 
-# Note: run_single_test and run_all_tests require actual API clients, so they would
-# need mocking or integration tests. For unit tests, we test load_questions which
+class TestPreloadContexts:
+    """Tests for preload_contexts function."""
+
+    def test_preload_contexts(self, monkeypatch, questions_dir, contexts_dir):
+        """Test that preloaded contexts are served without reading the files again."""
+        questions = load_questions(questions_dir, contexts_dir)
+        preload_contexts(questions)
+        monkeypatch.setattr(
+            Path, "read_text", lambda *args, **kwargs: pytest.fail("context read twice")
+        )
+
+        for question in questions:
+            assert f"context for question {question.number}" in question.load_context()
+
+    def test_preload_contexts_empty(self):
+        """Test that preloading no questions does nothing."""
+        preload_contexts([])
+
+
+class TestBuildPrompt:
+    """Tests for build_prompt function."""
+
+    def test_build_prompt_with_context(self, sample_question):
+        """Test that the context is returned and embedded in the prompt."""
+        context, prompt = build_prompt(sample_question, with_context=True)
+
+        assert context == sample_question.load_context()
+        assert context in prompt
+        assert sample_question.text in prompt
+
+    def test_build_prompt_without_context(self, sample_question):
+        """Test that no context is loaded when it isn't requested."""
+        context, prompt = build_prompt(sample_question, with_context=False)
+
+        assert context is None
+        assert "Context information:" not in prompt
+        assert sample_question.text in prompt
+
+
+class TestGradeBatchResponses:
+    """Tests for grade_batch_responses function."""
+
+    def test_grade_batch_responses_in_chunks(
+        self, monkeypatch, questions_dir, contexts_dir
+    ):
+        """Test that responses are graded in chunks and returned in question order."""
+        questions = load_questions(questions_dir, contexts_dir)[:5]
+        graded = []
+
+        def fake_grade_responses_batch(items):
+            graded.append(items)
+            return [
+                GradeBreakdown(accuracy=int(response[-1]) * 10, completeness=70, clarity=60)
+                for _, response in items
+            ]
+
+        monkeypatch.setattr(test_runner, "grade_responses_batch", fake_grade_responses_batch)
+        monkeypatch.setattr(test_runner, "GRADE_BATCH_SIZE", 2)
+
+        results = grade_batch_responses(
+            "test-model",
+            questions,
+            with_context=True,
+            responses=[(f"response {i}", 1.0 + i) for i in range(5)],
+        )
+
+        assert [len(items) for items in graded] == [2, 2, 1]
+        assert [r.question_number for r in results] == [1, 2, 3, 4, 5]
+        assert [r.response_time for r in results] == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert [r.grades.accuracy for r in results] == [0, 10, 20, 30, 40]
+        assert all(r.context_provided for r in results)
+
+    def test_grade_batch_responses_without_querying(self, monkeypatch, sample_question):
+        """Test that responses generated earlier can be graded on their own."""
+        monkeypatch.setattr(
+            test_runner,
+            "query_model_batch",
+            lambda *args: pytest.fail("grading must not query the model"),
+        )
+        monkeypatch.setattr(
+            test_runner,
+            "grade_responses_batch",
+            lambda items: [GradeBreakdown(accuracy=70, completeness=60, clarity=50)],
+        )
+
+        results = grade_batch_responses(
+            "test-model", [sample_question], with_context=False, responses=[("answer", 2.5)]
+        )
+
+        assert len(results) == 1
+        assert results[0].response == "answer"
+        assert results[0].response_time == 2.5
+        assert results[0].grades.accuracy == 70
+        assert not results[0].context_provided
+
+    def test_grade_batch_responses_keeps_failures_to_their_items(
+        self, monkeypatch, questions_dir, contexts_dir
+    ):
+        """Test that failed queries and grades only cost their own questions."""
+        questions = load_questions(questions_dir, contexts_dir)[:4]
+        graded = []
+
+        def fake_grade_responses_batch(items):
+            graded.append(items)
+            if any(response == "ungradable" for _, response in items):
+                raise RuntimeError("grading failed")
+            grades = GradeBreakdown(accuracy=80, completeness=80, clarity=80)
+            return [grades] * len(items)
+
+        monkeypatch.setattr(
+            test_runner, "grade_responses_batch", fake_grade_responses_batch
+        )
+        query_error = RuntimeError("query failed")
+
+        outcomes = grade_batch_responses(
+            "test-model",
+            questions,
+            with_context=False,
+            responses=[("a", 1.0), query_error, ("ungradable", 1.0), ("d", 1.0)],
+        )
+
+        assert outcomes[0].grades.accuracy == 80  # type: ignore[union-attr]
+        assert outcomes[1] is query_error
+        assert isinstance(outcomes[2], RuntimeError)
+        assert outcomes[3].grades.accuracy == 80  # type: ignore[union-attr]
+        # The failed query is never graded; the failed chunk is retried per item
+        assert [len(items) for items in graded] == [3, 1, 1, 1]
+
+    def test_grade_batch_responses_quota_errors_not_retried(
+        self, monkeypatch, questions_dir, contexts_dir
+    ):
+        """Test that a quota error fails its chunk without grading items one by one."""
+        questions = load_questions(questions_dir, contexts_dir)[:2]
+        calls = []
+
+        def fake_grade_responses_batch(items):
+            calls.append(items)
+            raise ResourceExhausted("quota")
+
+        monkeypatch.setattr(
+            test_runner, "grade_responses_batch", fake_grade_responses_batch
+        )
+
+        outcomes = grade_batch_responses(
+            "test-model",
+            questions,
+            with_context=False,
+            responses=[("a", 1.0), ("b", 1.0)],
+        )
+
+        assert all(isinstance(outcome, ResourceExhausted) for outcome in outcomes)
+        assert len(calls) == 1
+
+
+class TestRunSingleTestAsync:
+    """Tests for run_single_test_async function."""
+
+    @pytest.mark.asyncio
+    async def test_run_single_test_async_delegates(
+        self, monkeypatch, sample_question, sample_test_result
+    ):
+        """Test that the async wrapper runs the sync test and returns its result."""
+        calls = []
+
+        def fake_run_single_test(**kwargs):
+            calls.append(kwargs)
+            return sample_test_result
+
+        monkeypatch.setattr(test_runner, "run_single_test", fake_run_single_test)
+
+        result = await run_single_test_async(
+            client=None,  # type: ignore[arg-type]
+            model_id="test-model",
+            question=sample_question,
+            with_context=True,
+        )
+
+        assert result is sample_test_result
+        assert calls == [
+            {
+                "client": None,
+                "model_id": "test-model",
+                "question": sample_question,
+                "with_context": True,
+            }
+        ]
+
+
+class TestRunAllTests:
+    """Tests for run_all_tests function."""
+
+    def test_run_all_tests_skips_failures_and_keeps_order(
+        self, monkeypatch, sample_question, sample_test_result
+    ):
+        """Test that failed tests are dropped and the rest come back in order."""
+
+        def fake_run_single_test(client, model_id, question, with_context):
+            if model_id == "bad-model":
+                raise RuntimeError("boom")
+            return sample_test_result.model_copy(
+                update={"model_name": model_id, "context_provided": with_context}
+            )
+
+        monkeypatch.setattr(test_runner, "run_single_test", fake_run_single_test)
+
+        results = run_all_tests(
+            None,  # type: ignore[arg-type]
+            ["model-a", "bad-model", "model-b"],
+            [sample_question],
+        )
+
+        assert [(r.model_name, r.context_provided) for r in results] == [
+            ("model-a", False),
+            ("model-a", True),
+            ("model-b", False),
+            ("model-b", True),
+        ]
+
+    def test_run_all_tests_limits_concurrency(self, monkeypatch, sample_question, sample_test_result):
+        """Test that no more than max_concurrency tests run at once."""
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+        started = 0
+        # The first three tests only return once all three are running
+        all_started = threading.Barrier(3, timeout=5)
+
+        def fake_run_single_test(**kwargs):
+            nonlocal running, peak, started
+            with lock:
+                running += 1
+                peak = max(peak, running)
+                index = started
+                started += 1
+            if index < 3:
+                all_started.wait()
+            with lock:
+                running -= 1
+            return sample_test_result
+
+        monkeypatch.setattr(test_runner, "run_single_test", fake_run_single_test)
+
+        results = run_all_tests(
+            None,  # type: ignore[arg-type]
+            [f"model-{i}" for i in range(5)],
+            [sample_question],
+            max_concurrency=3,
+        )
+
+        assert len(results) == 10
+        assert peak == 3
+
+
+# Note: run_single_test requires actual API clients, so it would need mocking or
+# integration tests. For unit tests, we test load_questions which
 # doesn't require API calls.
@@ -1,8 +1,42 @@
 """Tests for watsonx client module."""
 
+import threading
+
+import httpx
 import pytest
 
-from modelgrader.watsonx_client import create_prompt
+from modelgrader import watsonx_client
+from modelgrader.watsonx_client import (
+    create_prompt,
+    create_watsonx_client,
+    list_available_models,
+    query_model,
+    query_model_batch,
+)
+
+
+class FakeModelInference:
+    """Stand-in for ModelInference that echoes prompts back."""
+
+    instances = 0
+
+    def __init__(self, **kwargs):
+        type(self).instances += 1
+
+    def chat(self, messages):
+        return {"choices": [{"message": {"content": f"echo: {messages[0]['content']}"}}]}
+
+
+@pytest.fixture
+def fake_inference(monkeypatch):
+    """Replace ModelInference so no WatsonX calls are made."""
+    FakeModelInference.instances = 0
+    monkeypatch.setattr(
+        "ibm_watsonx_ai.foundation_models.inference.ModelInference", FakeModelInference
+    )
+    watsonx_client._get_inference.cache_clear()
+    yield FakeModelInference
+    watsonx_client._get_inference.cache_clear()
 
 
 class TestCreatePrompt:
@@ -52,7 +86,211 @@ class TestCreatePrompt:
             assert "Context information:" not in prompt
 
 
-# Note: Other watsonx_client functions (create_watsonx_client, list_available_models,
-# query_model) require actual API credentials and connections, so they would need
-# mocking or integration tests. For unit tests, we test the functions that don't
-# require API calls.
+class TestQueryModelBatch:
+    """Tests for query_model_batch function."""
+
+    def test_query_model_batch_reuses_inference(self, fake_inference):
+        """Test that one inference instance serves every prompt in the batch."""
+        responses = query_model_batch(None, "test-model", ["one", "two", "three"])  # type: ignore[arg-type]
+
+        assert fake_inference.instances == 1
+        assert [text for text, _ in responses] == ["echo: one", "echo: two", "echo: three"]
+        assert all(elapsed >= 0 for _, elapsed in responses)
+
+    def test_query_model_batch_concurrent_keeps_order(self, fake_inference, monkeypatch):
+        """Test that prompts sent concurrently come back in prompt order."""
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+        # The first three prompts wait for each other, then finish in reverse
+        all_started = threading.Barrier(3, timeout=5)
+        finished = {n: threading.Event() for n in range(1, 7)}
+
+        def chat(self, messages):
+            nonlocal in_flight, peak
+            n = len(messages[0]["content"])
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            if n <= 3:
+                all_started.wait()
+                if n < 3:
+                    assert finished[n + 1].wait(timeout=5)
+            with lock:
+                in_flight -= 1
+            finished[n].set()
+            return {"choices": [{"message": {"content": messages[0]["content"]}}]}
+
+        monkeypatch.setattr(FakeModelInference, "chat", chat)
+        prompts = ["a" * n for n in range(1, 7)]
+
+        responses = query_model_batch(
+            None,  # type: ignore[arg-type]
+            "test-model",
+            prompts,
+            max_concurrency=3,
+        )
+
+        assert [text for text, _ in responses] == prompts  # type: ignore[misc]
+        assert fake_inference.instances == 1
+        assert peak == 3
+
+    @pytest.mark.parametrize("max_concurrency", [1, 3])
+    def test_query_model_batch_returns_errors_in_place(
+        self, fake_inference, monkeypatch, max_concurrency
+    ):
+        """Test that a failing prompt doesn't stop the rest of the batch."""
+
+        def chat(self, messages):
+            if messages[0]["content"] == "bad":
+                raise ValueError("bad request")
+            return {"choices": [{"message": {"content": messages[0]["content"]}}]}
+
+        monkeypatch.setattr(FakeModelInference, "chat", chat)
+
+        responses = query_model_batch(
+            None,  # type: ignore[arg-type]
+            "test-model",
+            ["one", "bad", "three"],
+            max_concurrency=max_concurrency,
+        )
+
+        assert responses[0][0] == "one"  # type: ignore[index]
+        assert isinstance(responses[1], ValueError)
+        assert responses[2][0] == "three"  # type: ignore[index]
+
+    def test_inference_reused_across_batches(self, fake_inference):
+        """Test that later batches for the same model reuse its inference instance."""
+        query_model_batch(None, "test-model", ["one"])  # type: ignore[arg-type]
+        query_model_batch(None, "test-model", ["two"])  # type: ignore[arg-type]
+        query_model_batch(None, "test-model", ["three"], temperature=0.2)  # type: ignore[arg-type]
+        query_model_batch(None, "other-model", ["four"])  # type: ignore[arg-type]
+
+        assert fake_inference.instances == 3
+
+    def test_query_model_batch_empty(self, fake_inference):
+        """Test that an empty batch returns no responses."""
+        assert query_model_batch(None, "test-model", []) == []  # type: ignore[arg-type]
+
+
+class TestListAvailableModels:
+    """Tests for list_available_models function."""
+
+    def test_filters_non_chat_visual_excluded_and_deprecated(self):
+        """Test that only text chat models are listed, sorted."""
+
+        def spec(model_id, tasks=("chat",), lifecycle=()):
+            return {
+                "model_id": model_id,
+                "tasks": [{"id": task} for task in tasks],
+                "lifecycle": [{"id": stage} for stage in lifecycle],
+            }
+
+        specs = {
+            "resources": [
+                spec("z-chat"),
+                spec("a-chat"),
+                spec("meta-llama/llama-3-2-11b-vision-instruct"),
+                spec("chart-model", tasks=("chat", "image_chat")),
+                spec("ibm/granite-guardian-3-8b"),
+                spec("ibm/granite-8b-code-instruct"),
+                spec("old-chat", lifecycle=("deprecated",)),
+                spec("embedder", tasks=("embedding",)),
+            ]
+        }
+
+        class FakeClient:
+            class foundation_models:
+                @staticmethod
+                def get_model_specs():
+                    return specs
+
+        assert list_available_models(FakeClient()) == ["a-chat", "z-chat"]  # type: ignore[arg-type]
+
+
+class TestQueryModelRetry:
+    """Tests for retrying WatsonX queries after network errors."""
+
+    @pytest.fixture(autouse=True)
+    def no_sleep(self, monkeypatch):
+        """Skip backoff delays."""
+        monkeypatch.setattr(watsonx_client.time, "sleep", lambda seconds: None)
+
+    def _failing_chat(self, monkeypatch, errors):
+        """Make chat raise the given errors in turn, then succeed."""
+        errors = iter(errors)
+        calls = []
+
+        def chat(self, messages):
+            calls.append(messages)
+            error = next(errors, None)
+            if error is not None:
+                raise error
+            return {"choices": [{"message": {"content": "ok"}}]}
+
+        monkeypatch.setattr(FakeModelInference, "chat", chat)
+        return calls
+
+    def test_retries_network_errors(self, fake_inference, monkeypatch):
+        """Test that timeouts and connection errors are retried."""
+        calls = self._failing_chat(
+            monkeypatch, [httpx.ReadTimeout("slow"), httpx.ConnectError("reset")]
+        )
+
+        response, elapsed = query_model(None, "test-model", "prompt")  # type: ignore[arg-type]
+
+        assert response == "ok"
+        assert elapsed >= 0
+        assert len(calls) == 3
+
+    def test_gives_up_after_max_retries(self, fake_inference, monkeypatch):
+        """Test that the error is raised once retries run out."""
+        calls = self._failing_chat(monkeypatch, [httpx.ReadTimeout("slow")] * 5)
+
+        with pytest.raises(httpx.ReadTimeout):
+            query_model(None, "test-model", "prompt", max_retries=1)  # type: ignore[arg-type]
+
+        assert len(calls) == 2
+
+    def test_sdk_retried_errors_not_retried_again(self, fake_inference, monkeypatch):
+        """Test that errors the SDK transport already retries propagate."""
+        calls = self._failing_chat(monkeypatch, [httpx.RemoteProtocolError("closed")])
+
+        with pytest.raises(httpx.RemoteProtocolError):
+            query_model(None, "test-model", "prompt")  # type: ignore[arg-type]
+
+        assert len(calls) == 1
+
+    def test_other_errors_not_retried(self, fake_inference, monkeypatch):
+        """Test that non-network errors propagate immediately."""
+        calls = self._failing_chat(monkeypatch, [ValueError("bad request")])
+
+        with pytest.raises(ValueError):
+            query_model(None, "test-model", "prompt")  # type: ignore[arg-type]
+
+        assert len(calls) == 1
+
+
+class TestCreateWatsonxClient:
+    """Tests for create_watsonx_client function."""
+
+    def test_connection_pool_sized_to_concurrency(self, monkeypatch):
+        """Test that the shared HTTP pool matches the requested size."""
+        created = {}
+
+        def fake_api_client(**kwargs):
+            created.update(kwargs)
+            return object()
+
+        monkeypatch.setattr("ibm_watsonx_ai.APIClient", fake_api_client)
+
+        create_watsonx_client(
+            "key", "project", "https://example.com", max_connections=24, timeout=45
+        )
+
+        limits = created["httpx_client"].limits
+        assert created["httpx_client"].timeout == httpx.Timeout(45)
+        assert limits.max_connections == 24
+        assert limits.max_keepalive_connections == 24
+        assert limits.keepalive_expiry == watsonx_client.KEEPALIVE_EXPIRY
+        assert created["project_id"] == "project"